@@ -1,149 +1,232 @@
+import aiohttp
 import discord
 from discord.ext import commands
 import asyncio
 
 
+import logging
 import os
+import re
 import sys
+import time
 from pathlib import Path
-import configparser
+
+# Buffered stream logging instead of unbuffered per-print stdio writes
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+log = logging.getLogger("raideye")
+
+# Matches "key = value" lines, skipping comments/blank lines, in one pass.
+# The key classes must not cross newlines, or a separator-less line would
+# be absorbed into the next line's key instead of being ignored.
+_PROP_RE = re.compile(rb'(?m)^[ \t]*([^#=\s][^=\n]*?)[ \t]*=[ \t]*(.*?)[ \t]*\r?$')
 
 # Read config from .properties file passed as first argument
 def load_properties_config(path):
-    config = {}
-    with open(path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-            if '=' in line:
-                k, v = line.split('=', 1)
-                config[k.strip()] = v.strip()
-    return config
+    """Parse a .properties file in a single buffered read + regex scan."""
+    raw = Path(path).read_bytes()
+    return {
+        k.decode('utf-8'): v.decode('utf-8')
+        for k, v in _PROP_RE.findall(raw)
+    }
 
 if len(sys.argv) > 1:
     config_path = sys.argv[1]
     config = load_properties_config(config_path)
     # Set all config values as environment variables for downstream code
-    for k, v in config.items():
-        os.environ[k] = v
+    os.environ.update(config)
 else:
-    print("No .properties config file provided! Exiting.")
+    log.error("No .properties config file provided! Exiting.")
     sys.exit(1)
 
-DISCORD_BOT_TOKEN = os.environ.get('DISCORD_TOKEN')
-BOT_PREFIX = os.environ.get('BOT_PREFIX', '!')
-GUILD_ID = int(os.environ.get('GUILD_ID', 0))
-MAIN_CHANNEL_ID = int(os.environ.get('MAIN_CHANNEL_ID', 0))
-RAIDEYE_SERVER = os.environ.get('RAIDEYE_SERVER', 'http://127.0.0.1:8000')
+class _LazyEnv:
+    """Resolve settings from os.environ on first attribute access.
 
-# Bot configuration
-INTENTS = discord.Intents.default()
-INTENTS.message_content = True
-INTENTS.guilds = True
-INTENTS.members = True
+    Values are cached on the instance, so each key is read and converted at
+    most once — nothing is parsed until something actually asks for it.
+    """
+    _INT_KEYS = {
+        'guild_id': 'GUILD_ID',
+        'main_channel_id': 'MAIN_CHANNEL_ID',
+    }
+    _STR_KEYS = {
+        'discord_bot_token': ('DISCORD_TOKEN', None),
+        'bot_prefix': ('BOT_PREFIX', '!'),
+        'raideye_server': ('RAIDEYE_SERVER', 'http://127.0.0.1:8000'),
+    }
+
+    def __getattr__(self, name):
+        if name in self._INT_KEYS:
+            value = int(os.environ.get(self._INT_KEYS[name], 0))
+        elif name in self._STR_KEYS:
+            env_key, default = self._STR_KEYS[name]
+            value = os.environ.get(env_key, default)
+        else:
+            raise AttributeError(name)
+        # Cache on the instance so __getattr__ is skipped next time
+        setattr(self, name, value)
+        return value
+
+CFG = _LazyEnv()
+
+# Bot configuration — subscribe only to the event streams the cogs use:
+# guilds + guild_messages/message_content for the auto-process listener,
+# members for siege mention resolution, guild_reactions for the
+# already-processed check. Everything else (typing, voice, DMs, invites,
+# integrations, ...) stays off to shrink gateway traffic.
+INTENTS = discord.Intents(
+    guilds=True,
+    guild_messages=True,
+    message_content=True,
+    members=True,
+    guild_reactions=True,
+)
 
 class RaidEyeBot(commands.Bot):
     def __init__(self):
         super().__init__(
-            command_prefix=BOT_PREFIX,  # Use prefix from config
+            command_prefix=CFG.bot_prefix,  # Use prefix from config
             intents=INTENTS,
             help_command=None  # Disable default help command
         )
-        self.guild_id = GUILD_ID
-        self.main_channel_id = MAIN_CHANNEL_ID
-        
+        self.guild_id = CFG.guild_id
+        self.main_channel_id = CFG.main_channel_id
+        # Reused for every guild-scoped sync/fetch instead of per-call allocation
+        self._guild_obj = discord.Object(id=self.guild_id) if self.guild_id else None
+        self.http_session: aiohttp.ClientSession = None
+        # Short-lived cache of fetch_commands results, keyed per scope
+        self._cmd_cache = {}
+        self._cmd_cache_ttl = 30.0
+
     async def setup_hook(self):
         """Called when the bot is starting up"""
-        print("Setting up bot...")
-        
+        log.info("Setting up bot...")
+
+        # Single shared HTTP session for all cogs so keep-alive connections,
+        # DNS cache, and connector pool are reused across the bot
+        self.http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=32,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+        )
+
         # Load all command cogs from the commands directory
         await self.load_commands()
         
         # Sync slash commands with Discord
         try:
             # Try guild-specific sync first (faster for testing)
-            if GUILD_ID:
-                guild = discord.Object(id=GUILD_ID)
+            if self._guild_obj is not None:
+                guild = self._guild_obj
                 self.tree.copy_global_to(guild=guild)
                 synced = await self.tree.sync(guild=guild)
-                print(f"Synced {len(synced)} command(s) to guild {GUILD_ID}")
+                log.info(f"Synced {len(synced)} command(s) to guild {self.guild_id}")
                 try:
                     names = [c.name for c in synced]
                     if names:
-                        print(f"Commands registered to guild {GUILD_ID}: {', '.join(names)}")
+                        log.info(f"Commands registered to guild {self.guild_id}: {', '.join(names)}")
                 except Exception:
                     pass
             else:
                 # Fallback to global sync
                 synced = await self.tree.sync()
-                print(f"Synced {len(synced)} command(s) globally")
+                log.info(f"Synced {len(synced)} command(s) globally")
                 try:
                     names = [c.name for c in synced]
                     if names:
-                        print(f"Global commands registered: {', '.join(names)}")
+                        log.info(f"Global commands registered: {', '.join(names)}")
                 except Exception:
                     pass
         except discord.Forbidden:
-            print("❌ Bot doesn't have permission to sync commands!")
-            print("Make sure the bot was invited with 'applications.commands' scope")
+            log.error("❌ Bot doesn't have permission to sync commands!")
+            log.info("Make sure the bot was invited with 'applications.commands' scope")
         except discord.HTTPException as e:
-            print(f"❌ HTTP error during sync: {e}")
+            log.error(f"❌ HTTP error during sync: {e}")
         except Exception as e:
-            print(f"❌ Failed to sync commands: {e}")
-            print("Commands will still work, but may take up to 1 hour to appear")
+            log.error(f"❌ Failed to sync commands: {e}")
+            log.info("Commands will still work, but may take up to 1 hour to appear")
     
     async def load_commands(self):
         """Load all command cogs from the commands directory"""
         commands_dir = Path("commands")
         if not commands_dir.exists():
             commands_dir.mkdir()
-            print(f"Created {commands_dir} directory")
+            log.info(f"Created {commands_dir} directory")
             return
         
-        # Load all Python files in the commands directory as cogs
-        for file in commands_dir.glob("*.py"):
-            if file.name.startswith("_"):
-                continue  # Skip private files
-                
-            cog_name = f"commands.{file.stem}"
-            try:
-                await self.load_extension(cog_name)
-                print(f"Loaded command: {file.stem}")
-            except Exception as e:
-                print(f"Failed to load {file.stem}: {e}")
+        # Load all Python files in the commands directory as cogs, in parallel
+        # so one slow cog import doesn't delay the rest (or the heartbeat).
+        # os.scandir avoids the extra per-entry stat calls Path.glob incurs.
+        with os.scandir(commands_dir) as it:
+            stems = [
+                entry.name[:-3] for entry in it
+                if entry.is_file(follow_symlinks=False)
+                and entry.name.endswith(".py")
+                and not entry.name.startswith("_")  # Skip private files
+            ]
+        results = await asyncio.gather(
+            *[
+                asyncio.wait_for(self.load_extension(f"commands.{stem}"), timeout=30)
+                for stem in stems
+            ],
+            return_exceptions=True
+        )
+        for stem, result in zip(stems, results):
+            if isinstance(result, BaseException):
+                log.error(f"Failed to load {stem}: {result}")
+            else:
+                log.info(f"Loaded command: {stem}")
     
+    async def _cached_fetch(self, guild=None):
+        """fetch_commands with a short TTL cache to avoid repeat REST calls"""
+        key = guild.id if guild else 'global'
+        now = time.monotonic()
+        hit = self._cmd_cache.get(key)
+        if hit and now - hit[0] < self._cmd_cache_ttl:
+            return hit[1]
+        cmds = await self.tree.fetch_commands(guild=guild)
+        self._cmd_cache[key] = (now, cmds)
+        return cmds
+
+    async def close(self):
+        """Shut down the bot, closing the shared HTTP session first"""
+        if self.http_session:
+            await self.http_session.close()
+        await super().close()
+
     async def on_ready(self):
         """Called when the bot is ready"""
-        print(f"{self.user} has connected to Discord!")
-        print(f"Bot is in {len(self.guilds)} guilds")
+        log.info(f"{self.user} has connected to Discord!")
+        log.info(f"Bot is in {len(self.guilds)} guilds")
         
         # Check if bot is in the configured guild
-        target_guild = self.get_guild(GUILD_ID)
+        target_guild = self.get_guild(self.guild_id)
         if target_guild:
-            print(f"✅ Connected to configured server: {target_guild.name}")
-            main_channel = self.get_channel(MAIN_CHANNEL_ID)
+            log.info(f"✅ Connected to configured server: {target_guild.name}")
+            main_channel = self.get_channel(self.main_channel_id)
             if main_channel:
-                print(f"✅ Found main channel: #{main_channel.name}")
+                log.info(f"✅ Found main channel: #{main_channel.name}")
             else:
-                print(f"⚠️ Main channel not found (ID: {MAIN_CHANNEL_ID})")
+                log.warning(f"⚠️ Main channel not found (ID: {self.main_channel_id})")
         else:
-            print(f"⚠️ Bot is not in the configured server (ID: {GUILD_ID})")
+            log.warning(f"⚠️ Bot is not in the configured server (ID: {self.guild_id})")
         
-        # Set bot status
-        await self.change_presence(
+        # Set bot status in the background; on_ready shouldn't wait on the
+        # extra gateway op (keep a reference so the task isn't GC'd)
+        self._presence_task = asyncio.create_task(self.change_presence(
             activity=discord.Activity(
                 type=discord.ActivityType.watching,
                 name="for raids | /info"
             )
-        )
+        ))
     
     async def on_command_error(self, ctx, error):
         """Handle command errors"""
         if isinstance(error, commands.CommandNotFound):
             return  # Ignore unknown commands
         
-        print(f"Command error: {error}")
+        log.info(f"Command error: {error}")
         await ctx.send(f"An error occurred: {error}")
     
     @commands.command(name='sync')
@@ -151,14 +234,15 @@ class RaidEyeBot(commands.Bot):
     async def sync_commands(self, ctx):
         """Manually sync slash commands (bot owner only)"""
         try:
-            if GUILD_ID:
-                guild = discord.Object(id=GUILD_ID)
+            if self._guild_obj is not None:
+                guild = self._guild_obj
                 self.tree.copy_global_to(guild=guild)
                 synced = await self.tree.sync(guild=guild)
                 await ctx.send(f"✅ Synced {len(synced)} commands to this guild!")
             else:
                 synced = await self.tree.sync()
                 await ctx.send(f"✅ Synced {len(synced)} commands globally!")
+            self._cmd_cache.clear()  # Command set changed; drop cached listings
         except Exception as e:
             await ctx.send(f"❌ Failed to sync: {e}")
     
@@ -168,8 +252,8 @@ class RaidEyeBot(commands.Bot):
         """Clear all slash commands (bot owner only)"""
         try:
             # Clear guild commands
-            if GUILD_ID:
-                guild = discord.Object(id=GUILD_ID)
+            if self._guild_obj is not None:
+                guild = self._guild_obj
                 self.tree.clear_commands(guild=guild)
                 synced = await self.tree.sync(guild=guild)
                 await ctx.send(f"✅ Cleared guild commands! Remaining: {len(synced)}")
@@ -178,6 +262,7 @@ class RaidEyeBot(commands.Bot):
             self.tree.clear_commands(guild=None)
             global_synced = await self.tree.sync()
             await ctx.send(f"✅ Cleared global commands! Remaining: {len(global_synced)}")
+            self._cmd_cache.clear()  # Command set changed; drop cached listings
             
         except Exception as e:
             await ctx.send(f"❌ Failed to clear commands: {e}")
@@ -192,20 +277,26 @@ class RaidEyeBot(commands.Bot):
                 color=discord.Color.blue()
             )
             
+            # Fetch guild and global commands concurrently — two independent
+            # REST round-trips, no reason to serialize them
+            if self._guild_obj is not None:
+                guild_commands, global_commands = await asyncio.gather(
+                    self._cached_fetch(guild=self._guild_obj),
+                    self._cached_fetch()
+                )
+            else:
+                guild_commands, global_commands = [], await self._cached_fetch()
+
             # Guild commands
-            if GUILD_ID:
-                guild = discord.Object(id=GUILD_ID)
-                guild_commands = await self.tree.fetch_commands(guild=guild)
-                if guild_commands:
-                    guild_list = "\n".join([f"• /{cmd.name}" for cmd in guild_commands])
-                    embed.add_field(
-                        name=f"🏰 Guild Commands ({len(guild_commands)})",
-                        value=guild_list,
-                        inline=False
-                    )
-            
+            if guild_commands:
+                guild_list = "\n".join([f"• /{cmd.name}" for cmd in guild_commands])
+                embed.add_field(
+                    name=f"🏰 Guild Commands ({len(guild_commands)})",
+                    value=guild_list,
+                    inline=False
+                )
+
             # Global commands
-            global_commands = await self.tree.fetch_commands()
             if global_commands:
                 global_list = "\n".join([f"• /{cmd.name}" for cmd in global_commands])
                 embed.add_field(
@@ -227,19 +318,19 @@ async def main():
     bot = RaidEyeBot()
     
     # Get bot token from config (which loads from environment/env file)
-    token = DISCORD_BOT_TOKEN
+    token = CFG.discord_bot_token
     if not token:
-        print("Error: DISCORD_BOT_TOKEN not found!")
-        print("Please set your Discord bot token in the .env file or as an environment variable.")
-        print("Example: DISCORD_BOT_TOKEN=your_token_here")
+        log.error("Error: DISCORD_BOT_TOKEN not found!")
+        log.info("Please set your Discord bot token in the .env file or as an environment variable.")
+        log.info("Example: DISCORD_BOT_TOKEN=your_token_here")
         return
     
     try:
         await bot.start(token)
     except discord.LoginFailure:
-        print("Invalid bot token provided!")
+        log.error("Invalid bot token provided!")
     except Exception as e:
-        print(f"An error occurred: {e}")
+        log.info(f"An error occurred: {e}")
     finally:
         await bot.close()
 
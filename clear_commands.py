@@ -10,43 +10,39 @@ from config import DISCORD_BOT_TOKEN, GUILD_ID
 
 async def clear_all_commands():
     """Clear all slash commands"""
-    
-    # Create a simple bot instance just for clearing commands
-    intents = discord.Intents.default()
-    bot = discord.Client(intents=intents)
-    
+
+    # Talk to the REST API directly — no Client, duplicate CommandTree, or
+    # gateway login needed just to PUT two empty command lists
+    http = discord.http.HTTPClient(asyncio.get_running_loop())
+
     try:
         print("🤖 Connecting to Discord...")
-        await bot.login(DISCORD_BOT_TOKEN)
-        
-        # Create application command tree
-        tree = discord.app_commands.CommandTree(bot)
-        
+        await http.static_login(DISCORD_BOT_TOKEN)
+        app_info = await http.application_info()
+        app_id = app_info['id']
+
         print("📋 Clearing commands...")
-        
+
         # Clear guild commands if GUILD_ID is set
         if GUILD_ID:
             print(f"Clearing guild commands for {GUILD_ID}...")
-            guild = discord.Object(id=GUILD_ID)
-            tree.clear_commands(guild=guild)
-            guild_synced = await tree.sync(guild=guild)
+            guild_synced = await http.bulk_upsert_guild_commands(app_id, GUILD_ID, [])
             print(f"✅ Guild commands cleared. Remaining: {len(guild_synced)}")
-        
+
         # Clear global commands
         print("Clearing global commands...")
-        tree.clear_commands(guild=None)
-        global_synced = await tree.sync(guild=None)
+        global_synced = await http.bulk_upsert_global_commands(app_id, [])
         print(f"✅ Global commands cleared. Remaining: {len(global_synced)}")
-        
+
         print("\n🎉 All commands have been cleared!")
         print("💡 You can now restart your bot to register fresh commands.")
-        
+
     except discord.LoginFailure:
         print("❌ Invalid bot token!")
     except Exception as e:
         print(f"❌ Error: {e}")
     finally:
-        await bot.close()
+        await http.close()
 
 if __name__ == "__main__":
     print("🧹 Discord Command Cleaner")
@@ -2,33 +2,118 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import aiohttp
-import json
+import asyncio
+import functools
+import orjson
 import os
 import io
 import logging
+import reprlib
 from typing import Optional, Literal
-from config import GUILD_ID, MAIN_CHANNEL_ID
+from yarl import URL
+
+# Bounded repr instances: unlike str(x)[:n] these stop recursing/stringifying
+# once the limits are hit instead of materializing the full representation
+_REPR = reprlib.Repr()
+_REPR.maxstring = 2000
+_REPR.maxdict = 20
+_REPR.maxlist = 20
+_REPR.maxother = 2000
+
+_FIELD_REPR = reprlib.Repr()
+_FIELD_REPR.maxstring = 1000
+_FIELD_REPR.maxother = 1000
+
+_ERR_REPR = reprlib.Repr()
+_ERR_REPR.maxstring = 500
+_ERR_REPR.maxother = 500
+
+# Resolve the server URL once at import so cog reloads don't re-read the
+# environment or rebuild the strings
+_SERVER_URL = os.getenv('RAIDEYE_SERVER', '127.0.0.1:8000')
+if not _SERVER_URL.startswith('http'):
+    _SERVER_URL = f'http://{_SERVER_URL}'
+_API_URL = f"{_SERVER_URL}/api/discord"
+
+
+@functools.lru_cache(maxsize=256)
+def _pretty(key: str) -> str:
+    """Turn a field key like 'active_members' into 'Active Members'.
+
+    Cached so repeated keys across responses skip the string work entirely.
+    """
+    return key.replace("_", " ").title()
+
+
+class _Limiter:
+    """Paces outbound requests to at most `rps` per second.
+
+    Used as a guard before hitting the RaidEye server so bursts of command
+    usage don't trigger upstream 429s.
+    """
+
+    def __init__(self, rps: float = 5.0):
+        self._interval = 1.0 / rps
+        self._lock = asyncio.Lock()
+        self._last = 0.0
+
+    async def acquire(self):
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            wait = self._last + self._interval - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last = loop.time()
+
 
 class ClanStatsCommands(commands.Cog):
     """Clan statistics and information commands"""
-    
+
+    # Color singletons shared across invocations instead of per-call factories
+    _C_BLUE = discord.Color.blue()
+    _C_GREEN = discord.Color.green()
+    _C_RED = discord.Color.red()
+    _C_ORANGE = discord.Color.orange()
+
     def __init__(self, bot):
         self.bot = bot
-        self.aiohttp_session: Optional[aiohttp.ClientSession] = None
-        self.server_url = os.getenv('RAIDEYE_SERVER', '127.0.0.1:8000')
-        if not self.server_url.startswith('http'):
-            self.server_url = f'http://{self.server_url}'
-        self.api_url = f"{self.server_url}/api/discord"
-    
-    async def cog_load(self):
-        """Called when the cog is loaded"""
-        self.aiohttp_session = aiohttp.ClientSession()
-    
-    async def cog_unload(self):
-        """Called when the cog is unloaded"""
-        if self.aiohttp_session:
-            await self.aiohttp_session.close()
-    
+        self.server_url = _SERVER_URL
+        self.api_url = _API_URL
+        self._limiter = _Limiter()
+        # Pre-parsed yarl URLs so aiohttp doesn't re-parse the strings on
+        # every request
+        self._u_stats = URL(f"{self.api_url}/clans/stats/msg")
+        self._u_root = URL(f"{self.server_url}/")
+        self._u_probes = [
+            ("Clan Stats", URL(f"{self.api_url}/clans/stats")),
+            ("Image Extraction", URL(f"{self.api_url}/extract/personal_scores/")),
+            ("Hydra Injection", URL(f"{self.api_url}/injest-hydra/")),
+            ("Chimera Injection", URL(f"{self.api_url}/injest-chimera/")),
+        ]
+
+    async def _offload(self, fn, *args):
+        """Run blocking or CPU-bound work off the event loop.
+
+        Use for things like encoding big payloads, file writes, or heavy
+        string assembly so the gateway heartbeat isn't starved.
+        """
+        return await asyncio.to_thread(fn, *args)
+
+    async def _get(self, url, **kwargs):
+        """Rate-limited GET with one backoff retry on 429/503.
+
+        Returns the (unreleased) response; call sites should use it as an
+        async context manager just like session.get.
+        """
+        await self._limiter.acquire()
+        resp = await self.bot.http_session.get(url, **kwargs)
+        if resp.status in (429, 503):
+            retry_after = float(resp.headers.get('Retry-After', '1'))
+            resp.release()
+            await asyncio.sleep(retry_after)
+            resp = await self.bot.http_session.get(url, **kwargs)
+        return resp
+
     @app_commands.command(name="clan-stats", description="Get detailed clan statistics")
     async def clan_stats(
         self, 
@@ -41,25 +126,22 @@ class ClanStatsCommands(commands.Cog):
         
         try:
             # Fetch clan stats from server
-            stats_url = f"{self.api_url}/clans/stats/msg"
-            
-            async with self.aiohttp_session.get(stats_url) as resp:
-                text = await resp.text()
-                
+            async with await self._get(self._u_stats) as resp:
                 if 200 <= resp.status < 300:
-                    # Parse response
+                    # Parse response directly with orjson; fall back to the
+                    # raw text when the body isn't valid JSON
                     try:
-                        data = json.loads(text)
+                        data = await resp.json(loads=orjson.loads, content_type=None)
                         message_text = data.get("message", str(data)) if isinstance(data, dict) else str(data)
                     except:
-                        message_text = text
-                    
+                        message_text = await resp.text()
+
                     
                     # Create embed for better formatting
                     embed = discord.Embed(
                         title="📊 Clan Statistics",
                         description=message_text,
-                        color=discord.Color.blue()
+                        color=self._C_BLUE
                     )
                     
                     embed.set_footer(text="Data retrieved from RaidEye server")
@@ -70,17 +152,21 @@ class ClanStatsCommands(commands.Cog):
                 
                 else:
                     # Error response
+                    text = await resp.text()
                     error_embed = discord.Embed(
                         title="❌ Failed to Fetch Clan Stats",
                         description=f"Server returned status {resp.status}",
-                        color=discord.Color.red()
+                        color=self._C_RED
                     )
                     
                     if len(text) <= 1000:
                         error_embed.add_field(name="Error Details", value=f"```{text}```", inline=False)
                         await interaction.followup.send(embed=error_embed)
                     else:
-                        error_file = discord.File(io.BytesIO(text.encode('utf-8')), filename="error_details.txt")
+                        # Cap pathological bodies and encode off the event loop
+                        # so a huge error payload can't stall the heartbeat
+                        payload = await self._offload(str.encode, text[:1_000_000], 'utf-8')
+                        error_file = discord.File(io.BytesIO(payload), filename="error_details.txt")
                         await interaction.followup.send(embed=error_embed, file=error_file)
         
         except Exception as e:
@@ -116,16 +202,16 @@ class ClanStatsCommands(commands.Cog):
     #         # Make request to server
     #         query_url = f"{self.api_url}/clans/query"
             
-    #         async with self.aiohttp_session.get(query_url, params=params) as resp:
+    #         async with self.bot.http_session.get(query_url, params=params) as resp:
     #             if 200 <= resp.status < 300:
     #                 try:
-    #                     data = await resp.json()
+    #                     data = await resp.json(loads=orjson.loads, content_type=None)
     #                 except:
     #                     data = {"message": await resp.text()}
                     
     #                 embed = discord.Embed(
     #                     title=f"📋 {query_type.name}",
-    #                     color=discord.Color.green()
+    #                     color=self._C_GREEN
     #                 )
                     
     #                 if clan_filter:
@@ -134,18 +220,19 @@ class ClanStatsCommands(commands.Cog):
     #                 # Format the response based on query type
     #                 if isinstance(data, dict):
     #                     if "clans" in data:
-    #                         clan_list = []
-    #                         for clan_name, clan_data in data["clans"].items():
-    #                             if isinstance(clan_data, dict):
-    #                                 members = clan_data.get("members", "Unknown")
-    #                                 level = clan_data.get("level", "Unknown")
-    #                                 clan_list.append(f"**{clan_name}** - Level {level} ({members} members)")
-    #                             else:
-    #                                 clan_list.append(f"**{clan_name}** - {clan_data}")
-                            
+    #                         # Only format the 10 entries we display; islice stops
+    #                         # early instead of materializing every clan line
+    #                         from itertools import islice
+    #                         def _fmt(name, d):
+    #                             if isinstance(d, dict):
+    #                                 return f"**{name}** - Level {d.get('level', 'Unknown')} ({d.get('members', 'Unknown')} members)"
+    #                             return f"**{name}** - {d}"
+    #                         clans = data["clans"]
+    #                         lines = [_fmt(n, d) for n, d in islice(clans.items(), 10)]
+
     #                         embed.add_field(
     #                             name="Clans",
-    #                             value="\n".join(clan_list[:10]) + ("\n..." if len(clan_list) > 10 else ""),
+    #                             value="\n".join(lines) + ("\n..." if len(clans) > 10 else ""),
     #                             inline=False
     #                         )
     #                     elif "message" in data:
@@ -154,12 +241,12 @@ class ClanStatsCommands(commands.Cog):
     #                         # Generic data formatting
     #                         for key, value in list(data.items())[:5]:  # Limit fields
     #                             embed.add_field(
-    #                                 name=key.replace("_", " ").title(),
-    #                                 value=str(value)[:1000],  # Limit field length
+    #                                 name=_pretty(key),
+    #                                 value=_FIELD_REPR.repr(value),  # Limit field length
     #                                 inline=True
     #                             )
     #                 else:
-    #                     embed.description = str(data)[:2000]
+    #                     embed.description = _REPR.repr(data)
                     
     #                 embed.set_footer(text=f"Query: {query_type.name}")
     #                 embed.timestamp = discord.utils.utcnow()
@@ -177,54 +264,67 @@ class ClanStatsCommands(commands.Cog):
         """Check the status of the RaidEye server"""
         await interaction.response.defer(thinking=True)
         
-        embed = discord.Embed(
-            title="🖥️ RaidEye Server Status",
-            color=discord.Color.blue()
+        async def _probe(name, url, timeout):
+            """Probe one endpoint, returning (name, status or exception).
+
+            Uses HEAD so only headers travel over the wire; falls back to GET
+            for servers that reject HEAD with 405.
+            """
+            client_timeout = aiohttp.ClientTimeout(total=timeout)
+            try:
+                async with self.bot.http_session.head(
+                    url, timeout=client_timeout, allow_redirects=False
+                ) as resp:
+                    if resp.status != 405:
+                        return name, resp.status
+                async with self.bot.http_session.get(
+                    url, timeout=client_timeout
+                ) as resp:
+                    return name, resp.status
+            except Exception as e:
+                return name, e
+
+        # Probe the root and all API endpoints concurrently, so total wait is
+        # the slowest probe rather than the sum of all of them
+        (_, base_status), *api_results = await asyncio.gather(
+            _probe("Server", self._u_root, 10),
+            *[_probe(name, url, 5) for name, url in self._u_probes]
         )
-        
-        # Test basic connectivity
-        try:
-            async with self.aiohttp_session.get(f"{self.server_url}/", timeout=10) as resp:
-                if resp.status == 200:
-                    embed.add_field(name="🟢 Server", value="Online", inline=True)
-                    embed.color = discord.Color.green()
-                else:
-                    embed.add_field(name="🟡 Server", value=f"Responding (HTTP {resp.status})", inline=True)
-                    embed.color = discord.Color.orange()
-        except Exception as e:
-            embed.add_field(name="🔴 Server", value="Offline or unreachable", inline=True)
-            embed.color = discord.Color.red()
-            embed.add_field(name="Error", value=str(e)[:500], inline=False)
-        
-        # Test API endpoints
-        api_endpoints = [
-            ("Clan Stats", f"{self.api_url}/clans/stats"),
-            ("Image Extraction", f"{self.api_url}/extract/personal_scores/"),
-            ("Hydra Injection", f"{self.api_url}/injest-hydra/"),
-            ("Chimera Injection", f"{self.api_url}/injest-chimera/"),
-        ]
-        
+
+        # Basic connectivity result
+        fields = []
+        if isinstance(base_status, Exception):
+            color = self._C_RED
+            fields.append({"name": "🔴 Server", "value": "Offline or unreachable", "inline": True})
+            fields.append({"name": "Error", "value": _ERR_REPR.repr(base_status), "inline": False})
+        elif base_status == 200:
+            color = self._C_GREEN
+            fields.append({"name": "🟢 Server", "value": "Online", "inline": True})
+        else:
+            color = self._C_ORANGE
+            fields.append({"name": "🟡 Server", "value": f"Responding (HTTP {base_status})", "inline": True})
+
         api_status = []
-        for name, url in api_endpoints:
-            try:
-                async with self.aiohttp_session.get(url, timeout=5) as resp:
-                    if 200 <= resp.status < 500:  # Accept any non-server-error status
-                        api_status.append(f"✅ {name}")
-                    else:
-                        api_status.append(f"❌ {name} ({resp.status})")
-            except Exception:
+        for name, status in api_results:
+            if isinstance(status, Exception):
                 api_status.append(f"❌ {name} (unreachable)")
-        
-        embed.add_field(
-            name="🔧 API Endpoints",
-            value="\n".join(api_status),
-            inline=False
-        )
-        
-        embed.add_field(name="🌐 Server URL", value=self.server_url, inline=False)
+            elif 200 <= status < 500:  # Accept any non-server-error status
+                api_status.append(f"✅ {name}")
+            else:
+                api_status.append(f"❌ {name} ({status})")
+
+        fields.append({"name": "🔧 API Endpoints", "value": "\n".join(api_status), "inline": False})
+        fields.append({"name": "🌐 Server URL", "value": self.server_url, "inline": False})
+
+        # Build the embed in one shot from a dict rather than per-field calls
+        embed = discord.Embed.from_dict({
+            "title": "🖥️ RaidEye Server Status",
+            "color": color.value,
+            "fields": fields,
+        })
         embed.set_footer(text="Status checked")
         embed.timestamp = discord.utils.utcnow()
-        
+
         await interaction.followup.send(embed=embed)
 
 async def setup(bot):
@@ -1,93 +1,197 @@
 import discord
 from discord.ext import commands
 from discord import Guild, app_commands
+from discord.utils import utcnow
 import aiohttp
-import json
+import asyncio
+import datetime
+import hashlib
+import orjson
 import os
+import random
+import re
+import time
+from collections import OrderedDict
 import io
 import logging
 from typing import Optional, Literal
 from config import GUILD_ID, MAIN_CHANNEL_ID
 
+logger = logging.getLogger(__name__)
+
+# Result-embed titles for the two known clash types, so the submit path
+# does a dict lookup instead of title-casing and formatting per response
+_SUCCESS_TITLE = {
+    'hydra': "✅ Hydra Processing Complete",
+    'chimera': "✅ Chimera Processing Complete",
+}
+_FAIL_TITLE = {
+    'hydra': "❌ Hydra Processing Failed",
+    'chimera': "❌ Chimera Processing Failed",
+}
+
+
+def _iso_z(dt: datetime.datetime) -> str:
+    """Format a UTC datetime as ISO-8601 with a Z suffix, ms precision.
+
+    One strftime instead of isoformat() plus a replace() scan; runs on
+    every ingestion request.
+    """
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+# Pulls (channel_id, message_id) out of a Discord message link in one scan
+# instead of blind split('/') indexing
+_LINK_RE = re.compile(r'channels/(?:@me|\d+)/(\d+)/(\d+)')
+
+# O(1) membership test per attachment instead of scanning a suffix tuple
+_IMG_EXTS = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp'})
+
+async def _bounded(sem: asyncio.Semaphore, coro):
+    """Await a coroutine while holding a slot on the semaphore"""
+    async with sem:
+        return await coro
+
 class HydraChimeraCommands(commands.Cog):
-     
+    """Hydra and Chimera clash processing commands"""
+
+    # How long a fetched clan list stays fresh, and how many classifier
+    # verdicts to remember
+    _CLAN_TTL = 300.0
+    _CLASSIFY_CACHE_MAX = 256
+    _OCR_CACHE_MAX = 512
+    # Failed extractions are only served from cache for this long
+    _NEG_TTL = 60.0
+    # Dry-run results are pure functions of their inputs; cache them briefly
+    # so a dry run resubmitted from the same message is a dict lookup
+    _RESULT_CACHE_MAX = 256
+    _RESULT_TTL = 120.0
+
+    # CPU-bound work on payloads above this size is pushed to a worker
+    # thread; below it, thread-dispatch overhead outweighs the stall
+    _OFFLOAD_BYTES = 512 * 1024
+
+    async def _post_with_retry(self, url, data_factory=None, max_tries=3, **kwargs):
+        """POST under the request semaphore, retrying throttled responses.
+
+        429/503 answers are retried up to `max_tries` times, honoring
+        Retry-After (with jitter) and sleeping outside the semaphore so a
+        throttled task doesn't hold a slot while it waits. `data_factory`
+        rebuilds single-use bodies (FormData with streams) per attempt.
+        Returns (status, body) with the response fully read.
+        """
+        retry_after = 0.0
+        for attempt in range(max_tries):
+            if data_factory is not None:
+                kwargs['data'] = data_factory()
+            async with self._req_sem:
+                async with self.aiohttp_session.post(url, **kwargs) as resp:
+                    if resp.status not in (429, 503) or attempt == max_tries - 1:
+                        # Read the body exactly once; callers parse these bytes
+                        return resp.status, await resp.read()
+                    retry_after = float(resp.headers.get('Retry-After', 2 ** attempt))
+            await asyncio.sleep(retry_after + random.uniform(0, 0.25))
+
     async def _post_image_extraction(self, img_data: bytes, filename: str, prompt_type: str):
         """Send image to extraction endpoint"""
         try:
             url = f"{self.api_url}/extract/personal_scores/"
-            
-            data = aiohttp.FormData()
-            data.add_field('images', img_data, filename=filename, content_type='image/png')
-            data.add_field('prompt_type', prompt_type)
-            
-            async with self.aiohttp_session.post(url, data=data) as resp:
-                text = await resp.text()
-                if 200 <= resp.status < 300:
-                    try:
-                        result_data = await resp.json()
-                        return {'success': True, 'data': result_data}
-                    except:
-                        return {'success': True, 'data': text}
-                else:
-                    return {'success': False, 'error': f"HTTP {resp.status}: {text}"}
-        
+
+            def _form():
+                data = aiohttp.FormData()
+                # img_data is either raw bytes (slash-command attachments) or
+                # a stream factory from _stream_url; a factory's chunks flow
+                # straight into the multipart body without a full in-memory
+                # copy. Rebuilt per attempt since FormData is single-use.
+                payload = img_data() if callable(img_data) else img_data
+                data.add_field('images', payload, filename=filename, content_type='image/png')
+                data.add_field('prompt_type', prompt_type)
+                return data
+
+            status, body = await self._post_with_retry(url, data_factory=_form)
+            if 200 <= status < 300:
+                try:
+                    return {'success': True, 'data': orjson.loads(body)}
+                except:
+                    return {'success': True, 'data': body.decode('utf-8', 'replace')}
+            else:
+                snippet = body[:512].decode('utf-8', 'replace')
+                return {'success': False, 'error': f"HTTP {status}: {snippet}"}
+
         except Exception as e:
             return {'success': False, 'error': str(e)}
-    
+
     async def _inject_clash_data(self, payload: dict, clash_type: str):
         """Send clash data to injection endpoint"""
         try:
             url = f"{self.api_url}/injest-{clash_type}/"
-            headers = {"Content-Type": "application/json"}
-            
-            async with self.aiohttp_session.post(url, data=json.dumps(payload), headers=headers) as resp:
-                text = await resp.text()
-                if 200 <= resp.status < 300:
-                    try:
-                        result_data = await resp.json()
-                        return {'success': True, 'data': result_data}
-                    except:
-                        return {'success': True, 'data': {'message': text}}
-                else:
-                    return {'success': False, 'error': f"HTTP {resp.status}: {text}"}
-        
+
+            # json= serializes via the session's orjson serializer and sets
+            # the Content-Type header itself
+            status, body = await self._post_with_retry(url, json=payload)
+            if 200 <= status < 300:
+                try:
+                    return {'success': True, 'data': orjson.loads(body)}
+                except:
+                    return {'success': True, 'data': {'message': body.decode('utf-8', 'replace')}}
+            else:
+                snippet = body[:512].decode('utf-8', 'replace')
+                return {'success': False, 'error': f"HTTP {status}: {snippet}"}
+
         except Exception as e:
             return {'success': False, 'error': str(e)}
 
     def _is_valid_image_attachment(self, attachment: discord.Attachment) -> bool:
         """Check if the attachment is a valid image file"""
-        if not attachment.filename:
+        name = attachment.filename
+        if not name:
             return False
-        valid_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp']
-        filename_lower = attachment.filename.lower()
-        has_valid_ext = any(filename_lower.endswith(ext) for ext in valid_extensions)
-        has_valid_content_type = attachment.content_type and attachment.content_type.startswith('image/')
-        return has_valid_ext or has_valid_content_type
+        if os.path.splitext(name)[1].lower() in _IMG_EXTS:
+            return True
+        content_type = attachment.content_type
+        return bool(content_type and content_type.startswith('image/'))
+    def _stream_url(self, url: str):
+        """Return a factory producing a chunked async byte stream for `url`.
+
+        The factory opens the CDN request only when the upload consumes it,
+        so image bytes flow source→sink in 64 KiB chunks instead of being
+        buffered whole in memory.
+        """
+        async def _gen():
+            async with self.aiohttp_session.get(url) as resp:
+                resp.raise_for_status()
+                async for chunk in resp.content.iter_chunked(65536):
+                    yield chunk
+        return _gen
+
+    @staticmethod
+    async def _materialize(img_data):
+        """Collapse a stream factory into bytes (no-op for bytes input)."""
+        if not callable(img_data):
+            return img_data
+        chunks = []
+        async for chunk in img_data():
+            chunks.append(chunk)
+        return b"".join(chunks)
+
     async def _extract_images_from_message(self, message: discord.Message):
-        """Extract valid image attachments from a Discord message."""
-        images = []
-        # Check attachments
-        for attachment in getattr(message, 'attachments', []):
-            if self._is_valid_image_attachment(attachment):
-                try:
-                    img_data = await attachment.read()
-                    images.append((img_data, attachment.filename))
-                except Exception as e:
-                    logging.warning(f"Failed to read attachment: {e}")
-        # Optionally, check embeds for images
-        for embed in getattr(message, 'embeds', []):
-            if embed.image and embed.image.url:
-                try:
-                    async with self.aiohttp_session.get(embed.image.url) as resp:
-                        if resp.status == 200:
-                            img_data = await resp.read()
-                            filename = os.path.basename(embed.image.url)
-                            images.append((img_data, filename))
-                except Exception as e:
-                    logging.warning(f"Failed to fetch embed image: {e}")
+        """Collect (stream_factory, filename) pairs for a message's images.
+
+        No bytes are downloaded here; each factory streams its image lazily
+        when the upload runs, keeping peak memory per image at chunk size.
+        """
+        images = [
+            (self._stream_url(attachment.url), attachment.filename)
+            for attachment in getattr(message, 'attachments', [])
+            if self._is_valid_image_attachment(attachment)
+        ]
+        images += [
+            (self._stream_url(embed.image.url), os.path.basename(embed.image.url))
+            for embed in getattr(message, 'embeds', [])
+            if embed.image and embed.image.url
+        ]
         return images
-    """Hydra and Chimera clash processing commands"""
-    
+
     def __init__(self, bot):
         self.bot = bot
         self.aiohttp_session: Optional[aiohttp.ClientSession] = None
@@ -95,9 +199,28 @@ class HydraChimeraCommands(commands.Cog):
         if not self.server_url.startswith('http'):
             self.server_url = f'http://{self.server_url}'
         self.api_url = f"{self.server_url}/api/discord"
-        
-        # Clan list fetched from API
+
+        # Caps concurrent backend requests; acquired inside the leaf request
+        # helpers so every caller shares one budget no matter how it fans out
+        self._req_sem = asyncio.Semaphore(int(os.getenv('RAIDEYE_CONCURRENCY', '8')))
+
+        # Pre-coerced IDs so the per-message filter is plain int compares
+        self._guild_id_int = int(GUILD_ID)
+        self._channel_id_int = int(MAIN_CHANNEL_ID)
+
+        # Clan list fetched from API, refreshed on a TTL via _get_clans
         self.clan_list = []
+        self._clan_list_expiry = 0.0
+        # Set while a refresh is in flight so concurrent callers share it
+        self._clans_inflight: Optional[asyncio.Future] = None
+        # LRU cache of classifier verdicts keyed by image-content hash
+        self._classify_cache: OrderedDict = OrderedDict()
+        # LRU cache of extraction results keyed by (clash_type, image hash)
+        self._ocr_cache: OrderedDict = OrderedDict()
+        # Short-TTL LRU of dry-run results, keyed per source message/inputs
+        self._result_cache: OrderedDict = OrderedDict()
+        # SelectOptions built once per clan-list refresh, shared by all views
+        self._clan_options: tuple = ()
 
         # Add context menu commands
         self.ctx_menu_hydra = app_commands.ContextMenu(
@@ -115,22 +238,73 @@ class HydraChimeraCommands(commands.Cog):
 
     async def cog_load(self):
         """Called when the cog is loaded"""
-        self.aiohttp_session = aiohttp.ClientSession()
-        # Fetch clan list from API
+        # This cog talks almost exclusively to the RaidEye backend, so tune
+        # the pool for one host: generous per-host keep-alive connections,
+        # cached DNS, and sane default timeouts for the image round-trips
+        connector = aiohttp.TCPConnector(
+            limit=64,
+            limit_per_host=32,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True
+        )
+        self.aiohttp_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=60, connect=10),
+            headers={'User-Agent': 'RaidEyeBot/1.0'},
+            json_serialize=lambda obj: orjson.dumps(obj).decode()
+        )
+        # Warm the clan list from the API
+        await self._get_clans()
+
+    async def _get_clans(self):
+        """Return the clan list, refreshing from the API when stale.
+
+        Cache misses are single-flight: the first caller performs the HTTP
+        round-trip while everyone arriving mid-fetch awaits the same future,
+        so cog reloads or early command bursts cost one /clans/ request.
+        """
+        if self.clan_list and time.monotonic() < self._clan_list_expiry:
+            return self.clan_list
+        if self._clans_inflight is not None:
+            return await self._clans_inflight
+        fut = self._clans_inflight = asyncio.get_running_loop().create_future()
         try:
-            async with self.aiohttp_session.get(f"{self.api_url}/clans/") as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    self.clan_list = data.get('clans', [])
-                    print(f"[clash_processing] Loaded clans: {self.clan_list}")
-                    logging.info(f"Loaded clans: {self.clan_list}")
-                else:
-                    print(f"[clash_processing] Failed to fetch clans from API: HTTP {resp.status}")
-                    logging.warning(f"Failed to fetch clans from API: HTTP {resp.status}")
-        except Exception as e:
-            print(f"[clash_processing] Error fetching clans from API: {e}")
-            logging.warning(f"Error fetching clans from API: {e}")
-    
+            try:
+                async with self.aiohttp_session.get(f"{self.api_url}/clans/") as resp:
+                    if resp.status == 200:
+                        data = await resp.json()
+                        self.clan_list = data.get('clans', [])
+                        self._clan_options = tuple(
+                            discord.SelectOption(label=clan, value=clan)
+                            for clan in self.clan_list[:25]
+                        )
+                        self._clan_list_expiry = time.monotonic() + self._CLAN_TTL
+                        logger.info("Loaded clans: %s", self.clan_list)
+                    else:
+                        logger.warning("Failed to fetch clans from API: HTTP %s", resp.status)
+            except Exception as e:
+                logger.warning("Error fetching clans from API: %s", e)
+        finally:
+            # Resolve waiters with whatever we have (possibly stale/empty).
+            # A cancelled waiter can cancel the shared future, so only set
+            # the result if nothing got there first.
+            self._clans_inflight = None
+            if not fut.done():
+                fut.set_result(self.clan_list)
+        return self.clan_list
+
+    def _clan_options_for(self, clan_list: list):
+        """Return SelectOptions for `clan_list`, reusing the shared tuple.
+
+        Views built from the cached clan list get copies of the prebuilt
+        options instead of allocating 25 SelectOptions per click; anything
+        else falls back to building them fresh.
+        """
+        if clan_list is self.clan_list and self._clan_options:
+            return list(self._clan_options)
+        return [discord.SelectOption(label=clan, value=clan) for clan in clan_list[:25]]
+
     async def cog_unload(self):
         """Called when the cog is unloaded"""
         if self.aiohttp_session:
@@ -141,7 +315,7 @@ class HydraChimeraCommands(commands.Cog):
             self.bot.tree.remove_command(self.ctx_menu_hydra.name, type=discord.AppCommandType.message)
             self.bot.tree.remove_command(self.ctx_menu_chimera.name, type=discord.AppCommandType.message)
         except Exception as e:
-            logging.warning(f"Failed to remove context menu commands: {e}")
+            logger.warning("Failed to remove context menu commands: %s", e)
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -157,26 +331,22 @@ class HydraChimeraCommands(commands.Cog):
             if not message or message.author.bot:
                 return
 
-            # Also ignore if this bot has already reacted to the message
+            # Ensure message is from configured guild and channel before any
+            # other inspection — messages elsewhere cost two int compares
+            if not message.guild or message.guild.id != self._guild_id_int:
+                return
+            if message.channel.id != self._channel_id_int:
+                return
+
+            # Also ignore if this bot has already reacted to the message.
+            # Reaction.me is set locally by discord.py, so this is a pure
+            # attribute scan — no users() pagination requests
             try:
-                bot_user_id = getattr(self.bot.user, 'id', None)
-                if bot_user_id and getattr(message, 'reactions', None):
-                    for react in message.reactions:
-                        try:
-                            async for u in react.users():
-                                if getattr(u, 'id', None) == bot_user_id:
-                                    return
-                        except Exception:
-                            # Some reaction user enumerations can fail; ignore and continue
-                            continue
+                if any(getattr(r, 'me', False) for r in getattr(message, 'reactions', None) or []):
+                    return
             except Exception:
                 # Be conservative: if reaction inspection fails, continue processing
                 return
-            # Ensure message is from configured guild and channel
-            if not message.guild or int(message.guild.id) != int(GUILD_ID):
-                return
-            if int(message.channel.id) != int(MAIN_CHANNEL_ID):
-                return
 
             # Extract images
             images = await self._extract_images_from_message(message)
@@ -187,51 +357,81 @@ class HydraChimeraCommands(commands.Cog):
             # with a prompt_type of 'classify'. The endpoint should return JSON that
             # includes a type field, e.g. {"type": "Hydra"} or {"type": "Chimera"}.
             clash_type = None
+            extraction_result = None
             try:
-                img0_data, img0_name = images[0]
-                extraction_result = await self._post_image_extraction(img0_data, img0_name, "classify")
-                print(f"[clash_processing] Classifier extraction result: {extraction_result}")
-                if extraction_result.get('success'):
-                    data = extraction_result.get('data')
-                    ctype = None
-                    if isinstance(data, dict):
-                        # Try several common keys
-                        ctype = data.get('Clash Type')
-                    elif isinstance(data, list) and data:
-                        first = data[0]
-                        if isinstance(first, dict):
-                            ctype = first.get('Clash Type')
-                        else:
-                            ctype = str(first)
-                    elif isinstance(data, str):
-                        ctype = data
-                    else:
+                img0_src, img0_name = images[0]
+                # The first image is needed in full for hashing anyway, so
+                # materialize it once and reuse the bytes for the later upload
+                img0_data = await self._materialize(img0_src)
+                images[0] = (img0_data, img0_name)
+                # Identical bytes (reposts, retries) skip the remote classifier
+                # Hash large images off the event loop so the gateway
+                # heartbeat isn't starved while digesting megabytes
+                if len(img0_data) > self._OFFLOAD_BYTES:
+                    digest = await asyncio.to_thread(hashlib.blake2b, img0_data, digest_size=16)
+                else:
+                    digest = hashlib.blake2b(img0_data, digest_size=16)
+                cache_key = digest.hexdigest()
+                cached = self._classify_cache.get(cache_key)
+                if cached is not None:
+                    self._classify_cache.move_to_end(cache_key)
+                    clash_type = cached
+                else:
+                    extraction_result = await self._post_image_extraction(img0_data, img0_name, "classify")
+                    # Formatting the full result is only worth it when debug
+                    # logging is actually on
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Classifier extraction result: %s", extraction_result)
+                    if extraction_result.get('success'):
+                        data = extraction_result.get('data')
                         ctype = None
+                        if isinstance(data, dict):
+                            # Try several common keys
+                            ctype = data.get('Clash Type')
+                        elif isinstance(data, list) and data:
+                            first = data[0]
+                            if isinstance(first, dict):
+                                ctype = first.get('Clash Type')
+                            else:
+                                ctype = str(first)
+                        elif isinstance(data, str):
+                            ctype = data
+                        else:
+                            ctype = None
 
-                    if ctype:
-                        ctype_str = str(ctype).lower()
-                        if 'hydra' in ctype_str:
-                            clash_type = 'hydra'
-                        elif 'chimera' in ctype_str:
-                            clash_type = 'chimera'
-                else:
-                    logging.warning(f"Classifier extraction failed: {extraction_result.get('error')}")
+                        if ctype:
+                            ctype_str = str(ctype).lower()
+                            if 'hydra' in ctype_str:
+                                clash_type = 'hydra'
+                            elif 'chimera' in ctype_str:
+                                clash_type = 'chimera'
+
+                        if clash_type:
+                            self._classify_cache[cache_key] = clash_type
+                            if len(self._classify_cache) > self._CLASSIFY_CACHE_MAX:
+                                self._classify_cache.popitem(last=False)
+                    else:
+                        logger.warning("Classifier extraction failed: %s", extraction_result.get('error'))
             except Exception as e:
-                logging.exception(f"Error during classification via extraction endpoint: {e}")
+                logger.exception("Error during classification via extraction endpoint")
 
             if clash_type not in ('hydra', 'chimera'):
-                # Could not determine type; include full extraction_result for debugging
+                # Could not determine type; include full extraction_result for debugging.
+                # orjson serializes straight to UTF-8 bytes, so the size check
+                # and file attachment work without a separate encode pass
                 try:
-                    dump = json.dumps(extraction_result, indent=2, default=str)
+                    dump_bytes = await asyncio.to_thread(
+                        orjson.dumps, extraction_result, option=orjson.OPT_INDENT_2, default=str
+                    )
                 except Exception:
-                    dump = str(extraction_result)
+                    dump_bytes = str(extraction_result).encode('utf-8', 'replace')
 
                 try:
                     # If small enough to include in message, send inline; otherwise attach as file
-                    if len(dump) <= 1900:
-                        await message.reply(f"❌ Could not classify image type for automatic processing.\n```json\n{dump}\n```")
+                    if len(dump_bytes) <= 1900:
+                        await message.reply(f"❌ Could not classify image type for automatic processing.\n```json\n{dump_bytes.decode('utf-8')}\n```")
                     else:
-                        fp = io.BytesIO(dump.encode('utf-8'))
+                        fp = io.BytesIO(dump_bytes)
                         fname = f"classify_result_{message.id}.json"
                         file = discord.File(fp, filename=fname)
                         await message.reply("❌ Could not classify image type for automatic processing. Full result attached.", file=file)
@@ -272,24 +472,18 @@ class HydraChimeraCommands(commands.Cog):
                     pass
 
         except Exception as e:
-            logging.exception(f"Error in on_message auto-process: {e}")
+            logger.exception("Error in on_message auto-process")
     
-    @app_commands.command(name="hydra", description="Process images for Hydra clash records")
-    @app_commands.describe(
-        clan_token="Clan identifier (e.g., '1', '2', etc.)",
-        image="Image file to process (optional)",
-        message_link="Discord message link containing images (optional)",
-        dry_run="Preview what would be sent without actually processing"
-    )
-    async def process_hydra(
-        self, 
-        interaction: discord.Interaction, 
-        clan_token: Optional[str] = None,
-        image: Optional[discord.Attachment] = None,
-        message_link: Optional[str] = None,
-        dry_run: bool = False
+    async def _handle_clash_command(
+        self,
+        interaction: discord.Interaction,
+        clash_type: str,
+        clan_token: Optional[str],
+        image: Optional[discord.Attachment],
+        message_link: Optional[str],
+        dry_run: bool
     ):
-        """Process images as Hydra clash records"""
+        """Shared implementation behind the /hydra and /chimera commands"""
         await interaction.response.defer(thinking=True)
         
         message = None
@@ -310,10 +504,12 @@ class HydraChimeraCommands(commands.Cog):
         
         # Priority 2: Message link
         elif message_link:
+            match = _LINK_RE.search(message_link)
+            if not match:
+                await interaction.followup.send("❌ Invalid message link")
+                return
             try:
-                parts = message_link.strip().split('/')
-                message_id = int(parts[-1])
-                channel_id = int(parts[-2])
+                channel_id, message_id = int(match[1]), int(match[2])
                 channel = await self.bot.fetch_channel(channel_id)
                 message = await channel.fetch_message(message_id)
                 images_to_process = await self._extract_images_from_message(message)
@@ -334,18 +530,26 @@ class HydraChimeraCommands(commands.Cog):
         try:
             # Process first image with the declared clash type, then send any
             # remaining images as extraction-only results to be aggregated.
-            results = []
-            first_img = images_to_process[0]
-            first_result = await self._process_clash_images([first_img], "hydra", clan_token, dry_run)
-            results.append(first_result)
-
-            remaining_extractions = []
-            # Process remaining images (extraction-only)
-            for img_data, filename in images_to_process[1:]:
-                res = await self._process_clash_images([(img_data, filename)], "", clan_token, dry_run)
-                results.append(res)
-                if res.get('success') and 'extraction' in res:
-                    remaining_extractions.append(res['extraction'])
+            # One timestamp for the whole batch: consistent date_recorded
+            # across images and no per-image datetime formatting
+            batch_ts = _iso_z(utcnow())
+            # Fan the images out concurrently; the shared request semaphore
+            # inside the leaf helpers bounds actual backend traffic
+            tasks = [self._process_clash_images([images_to_process[0]], clash_type, clan_token, dry_run, batch_ts)]
+            tasks += [
+                self._process_clash_images([(img_data, filename)], "", clan_token, dry_run, batch_ts)
+                for img_data, filename in images_to_process[1:]
+            ]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            results = [
+                r if not isinstance(r, BaseException) else {'success': False, 'error': str(r)}
+                for r in results
+            ]
+            first_result = results[0]
+            remaining_extractions = [
+                r['extraction'] for r in results[1:]
+                if r.get('success') and 'extraction' in r
+            ]
 
             # If first image resulted in a real clash (injection), and we have
             # extra extraction results, POST them to /api/clash-scores/ to add
@@ -369,46 +573,73 @@ class HydraChimeraCommands(commands.Cog):
                     }
                     try:
                         url = f"{self.server_url}/api/clash-scores/"
-                        async with self.aiohttp_session.post(url, json=body) as resp:
-                            text = await resp.text()
-                            if 200 <= resp.status < 300:
-                                try:
-                                    aggregate_post_result = await resp.json()
-                                except Exception:
-                                    aggregate_post_result = {'message': text}
-                            else:
-                                aggregate_post_result = {'error': f"HTTP {resp.status}: {text}"}
-                    except Exception as e:
+                        status, raw = await self._post_with_retry(url, json=body)
+                        if 200 <= status < 300:
+                            try:
+                                aggregate_post_result = orjson.loads(raw)
+                            except orjson.JSONDecodeError:
+                                aggregate_post_result = {'message': raw.decode('utf-8', 'replace')}
+                        else:
+                            aggregate_post_result = {'error': f"HTTP {status}: {raw.decode('utf-8', 'replace')}"}
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                         aggregate_post_result = {'error': str(e)}
 
-            # Build response text for the user
-            response_text = f"✅ **Hydra Clash Processed**\n"
-            response_text += f"📊 Processed {len(images_to_process)} image(s)\n"
-            response_text += f"🏰 Clan: {clan_token or 'Not specified'}\n"
+            # Build response text for the user as a list of parts; a single
+            # join avoids quadratic str concatenation on large batches
+            parts = [
+                f"✅ **{clash_type.title()} Clash Processed**\n",
+                f"📊 Processed {len(images_to_process)} image(s)\n",
+                f"🏰 Clan: {clan_token or 'Not specified'}\n",
+            ]
 
+            length = sum(map(len, parts))
             for idx, result in enumerate(results, 1):
+                if length > 2000:
+                    # Past Discord's message cap already; stop building text
+                    # the final slice would throw away
+                    break
                 if result.get('success'):
-                    response_text += f"\nImage {idx}: Success"
+                    piece = f"\nImage {idx}: Success"
                     if result.get('view_url'):
-                        response_text += f" | [View Record]({result['view_url']})"
+                        piece += f" | [View Record]({result['view_url']})"
                     if dry_run and result.get('dry_run_payload'):
-                        preview = result['dry_run_payload'][:500]
-                        response_text += f"\nPreview: ```json\n{preview}\n```"
+                        suffix = "\n... (truncated)" if result.get('dry_run_truncated') else ""
+                        piece += f"\nPreview: ```json\n{result['dry_run_payload']}{suffix}\n```"
                 else:
-                    response_text += f"\nImage {idx}: ❌ Failed - {result.get('error', 'Unknown error')}"
+                    piece = f"\nImage {idx}: ❌ Failed - {result.get('error', 'Unknown error')}"
+                parts.append(piece)
+                length += len(piece)
 
             if aggregate_post_result:
                 if aggregate_post_result.get('error'):
-                    response_text += f"\n\n⚠️ Failed to aggregate extra scores: {aggregate_post_result.get('error')}"
+                    parts.append(f"\n\n⚠️ Failed to aggregate extra scores: {aggregate_post_result.get('error')}")
                 else:
-                    response_text += "\n\n✅ Extra scores aggregated to activity"
+                    parts.append("\n\n✅ Extra scores aggregated to activity")
 
             if dry_run:
-                response_text += f"\n\n**DRY RUN - No data was actually sent**"
+                parts.append("\n\n**DRY RUN - No data was actually sent**")
 
-            await interaction.followup.send(response_text[:2000])
+            await interaction.followup.send("".join(parts)[:2000])
         except Exception as e:
-            await interaction.followup.send(f"❌ Error processing Hydra clash: {e}")
+            await interaction.followup.send(f"❌ Error processing {clash_type.title()} clash: {e}")
+
+    @app_commands.command(name="hydra", description="Process images for Hydra clash records")
+    @app_commands.describe(
+        clan_token="Clan identifier (e.g., '1', '2', etc.)",
+        image="Image file to process (optional)",
+        message_link="Discord message link containing images (optional)",
+        dry_run="Preview what would be sent without actually processing"
+    )
+    async def process_hydra(
+        self, 
+        interaction: discord.Interaction, 
+        clan_token: Optional[str] = None,
+        image: Optional[discord.Attachment] = None,
+        message_link: Optional[str] = None,
+        dry_run: bool = False
+    ):
+        """Process images as Hydra clash records"""
+        return await self._handle_clash_command(interaction, "hydra", clan_token, image, message_link, dry_run)
     
     @app_commands.command(name="chimera", description="Process images for Chimera clash records")
     @app_commands.describe(
@@ -426,126 +657,45 @@ class HydraChimeraCommands(commands.Cog):
         dry_run: bool = False
     ):
         """Process images as Chimera clash records"""
-        await interaction.response.defer(thinking=True)
-        
-        message = None
-        images_to_process = []
-        
-        # Priority 1: Direct image attachment
-        if image:
-            if self._is_valid_image_attachment(image):
+        return await self._handle_clash_command(interaction, "chimera", clan_token, image, message_link, dry_run)
+    
+    async def _resolve_member_ids(self, guild: Guild, usernames):
+        """Map Discord usernames to member IDs.
+
+        One pass over the member cache builds a name→id index so each
+        username is a dict lookup (get_member_named rescans the full cache
+        per name, and also matches nicks/global names — we want exact
+        member.name matches only); names the cache doesn't know are looked
+        up via query_members, at most five gateway requests in flight at a
+        time.
+        """
+        index = {member.name: member.id for member in guild.members}
+        ids = {}
+        missing = []
+        for name in usernames:
+            member_id = index.get(name)
+            if member_id is not None:
+                ids[name] = member_id
+            else:
+                missing.append(name)
+        if missing:
+            sem = asyncio.Semaphore(5)
+
+            async def _lookup(name):
                 try:
-                    img_data = await image.read()
-                    images_to_process.append((img_data, image.filename))
+                    found = await guild.query_members(query=name, limit=1)
                 except Exception as e:
-                    await interaction.followup.send(f"❌ Failed to read attached image: {e}")
+                    logger.warning("Member lookup failed for %s: %s", name, e)
                     return
-            else:
-                await interaction.followup.send("❌ Please attach a valid image file (PNG, JPG, JPEG, GIF, WebP)")
-                return
-        
-        # Priority 2: Message link
-        elif message_link:
-            try:
-                parts = message_link.strip().split('/')
-                message_id = int(parts[-1])
-                channel_id = int(parts[-2])
-                channel = await self.bot.fetch_channel(channel_id)
-                message = await channel.fetch_message(message_id)
-                images_to_process = await self._extract_images_from_message(message)
-            except Exception as e:
-                await interaction.followup.send(f"❌ Failed to fetch message: {e}")
-                return
-        
-        # No input provided
-        else:
-            await interaction.followup.send("❌ Please provide either an image attachment, a message link, or use the context menu on a message with images.")
-            return
-        
-        if not images_to_process:
-            await interaction.followup.send("❌ No valid images found to process.")
-            return
-        
-        # Process each image separately
-        try:
-            # Process first image with the declared clash type, then send any
-            # remaining images as extraction-only results to be aggregated.
-            results = []
-            first_img = images_to_process[0]
-            first_result = await self._process_clash_images([first_img], "chimera", clan_token, dry_run)
-            results.append(first_result)
-
-            remaining_extractions = []
-            # Process remaining images (extraction-only)
-            for img_data, filename in images_to_process[1:]:
-                res = await self._process_clash_images([(img_data, filename)], "", clan_token, dry_run)
-                results.append(res)
-                if res.get('success') and 'extraction' in res:
-                    remaining_extractions.append(res['extraction'])
+                if found and found[0].name == name:
+                    ids[name] = found[0].id
 
-            # If first image resulted in a real clash (injection), and we have
-            # extra extraction results, POST them to /api/clash-scores/ to add
-            # the additional scores to the created activity.
-            aggregate_post_result = None
-            if first_result.get('success') and not dry_run:
-                clash_id = first_result.get('clash_id')
-                clash_type_val = first_result.get('clash_type')
-                if clash_id and remaining_extractions:
-                    # Build scores payload from remaining extractions.
-                    scores_payload = None
-                    if len(remaining_extractions) == 1:
-                        scores_payload = remaining_extractions[0]
-                    else:
-                        scores_payload = remaining_extractions
-
-                    body = {
-                        'activity_id': clash_id,
-                        'activity_type': clash_type_val,
-                        'scores': scores_payload
-                    }
-                    try:
-                        url = f"{self.server_url}/api/clash-scores/"
-                        async with self.aiohttp_session.post(url, json=body) as resp:
-                            text = await resp.text()
-                            if 200 <= resp.status < 300:
-                                try:
-                                    aggregate_post_result = await resp.json()
-                                except Exception:
-                                    aggregate_post_result = {'message': text}
-                            else:
-                                aggregate_post_result = {'error': f"HTTP {resp.status}: {text}"}
-                    except Exception as e:
-                        aggregate_post_result = {'error': str(e)}
-
-            # Build response text for the user
-            response_text = f"✅ **Chimera Clash Processed**\n"
-            response_text += f"📊 Processed {len(images_to_process)} image(s)\n"
-            response_text += f"🏰 Clan: {clan_token}\n"
-
-            for idx, result in enumerate(results, 1):
-                if result.get('success'):
-                    response_text += f"\nImage {idx}: Success"
-                    if result.get('view_url'):
-                        response_text += f" | [View Record]({result['view_url']})"
-                    if dry_run and result.get('dry_run_payload'):
-                        preview = result['dry_run_payload'][:500]
-                        response_text += f"\nPreview: ```json\n{preview}\n```"
-                else:
-                    response_text += f"\nImage {idx}: ❌ Failed - {result.get('error', 'Unknown error')}"
-
-            if aggregate_post_result:
-                if aggregate_post_result.get('error'):
-                    response_text += f"\n\n⚠️ Failed to aggregate extra scores: {aggregate_post_result.get('error')}"
-                else:
-                    response_text += "\n\n✅ Extra scores aggregated to activity"
-
-            if dry_run:
-                response_text += f"\n\n**DRY RUN - No data was actually sent**"
+            await asyncio.gather(
+                *[_bounded(sem, _lookup(name)) for name in missing],
+                return_exceptions=True
+            )
+        return ids
 
-            await interaction.followup.send(response_text[:2000])
-        except Exception as e:
-            await interaction.followup.send(f"❌ Error processing Chimera clash: {e}")
-    
     @app_commands.command(name="siege", description="Manage siege plans - notify participants or edit assignments")
     @app_commands.describe(
         action="Action to perform (notify participants or edit plan)",
@@ -578,19 +728,30 @@ class HydraChimeraCommands(commands.Cog):
                             plan_name = result_data.get('name', 'Unknown Plan')
                             assignments = result_data.get('assignments', [])
                             towers = result_data.get('towers', [])
+
+                            # Resolve every mentioned username up front: cache
+                            # hits are O(1), cold-cache misses fall back to a
+                            # bounded gateway query instead of silently failing
+                            usernames = {
+                                (a.get('assigned_player') or {}).get('discord', '')
+                                for a in assignments
+                            }
+                            usernames.discard('')
+                            name_to_id = await self._resolve_member_ids(interaction.guild, usernames)
                             
                             embed = discord.Embed(
                                 title=f"🏰 Siege Plan: {plan_name}",
                                 description=f"Plan ID: {plan_id}",
                                 color=discord.Color.blue()
                             )
-                            assignments_text = ""
-                            towers_text = ""
+                            # Collect lines and join once; += on str risks
+                            # quadratic behavior on big plans
+                            assignment_lines = []
+                            tower_lines = []
                             # Format assignments
                             if assignments:
                                 
                                 for assignment in assignments:
-                                    print(assignment)
                                     post_num = assignment.get('post_number', 'Unknown')
                                     team_choice = assignment.get('team_choice', 'No team')
                                     assigned_player = assignment.get('assigned_player') or {}
@@ -600,21 +761,20 @@ class HydraChimeraCommands(commands.Cog):
                                     
                                     # Format the line
                                     line = f"Post {post_num} - {player_name if player_name else 'No Player Assigned'} - {team_choice if team_choice else 'No Condition Assigned'}"
-                                    for member in interaction.guild.members:
-                                        if member.name == discord_username:
-                                           line += f" -> <@{member.id}>" 
+                                    # Unassigned posts have no username; skip the lookup
+                                    member_id = name_to_id.get(discord_username) if discord_username else None
+                                    if member_id:
+                                        line += f" -> <@{member_id}>"
                                     # Print just the champ names if selected_arena_team is a dict with 'champions'
                                     if isinstance(selected_arena_team, dict) and 'champions' in selected_arena_team:
                                         champs = ', '.join(selected_arena_team['champions'])
                                         line += f" ({champs})"
                                     elif selected_arena_team and selected_arena_team != 'No arena team':
                                         line += f" ({selected_arena_team})"
-                                    assignments_text += line + "\n"
-                                
-                                
+                                    assignment_lines.append(line)
+                                assignments_text = "\n".join(assignment_lines) + "\n"
                             else:
                                 assignments_text = "No Assignments"
-                                pass
                             
                             if towers:
                                 
@@ -628,15 +788,14 @@ class HydraChimeraCommands(commands.Cog):
                                     
                                     # Format the line
                                     line = f"{t_display} - {player_name if player_name else 'No Player Assigned'}"
-                                    for member in interaction.guild.members:
-                                        if member.name == discord_username:
-                                           line += f" -> <@{member.id}>" 
+                                    member_id = name_to_id.get(discord_username) if discord_username else None
+                                    if member_id:
+                                        line += f" -> <@{member_id}>"
 
-                                    towers_text += line + "\n"
-                                
+                                    tower_lines.append(line)
+                                towers_text = "\n".join(tower_lines) + "\n"
                             else:
                                 towers_text = "No Assignments"
-                                pass
                             
                             post_text = f"**Posts:**\n{assignments_text}\n**Towers:**\n{towers_text}"
 
@@ -648,39 +807,46 @@ class HydraChimeraCommands(commands.Cog):
                         except Exception as parse_error:
                             # If response isn't JSON or parsing fails
                             text_response = await resp.text()
-                            embed = discord.Embed(
-                                title="🏰 Siege Plan Notifications Sent",
-                                description=f"Successfully notified participants for siege plan #{plan_id}",
-                                color=discord.Color.green()
-                            )
-                            embed.add_field(name="📋 Plan ID", value=plan_id, inline=True)
-                            embed.add_field(name="📡 Response", value=text_response[:1000], inline=False)
-                            embed.set_footer(text=f"Parse error: {str(parse_error)}")
+                            # One from_dict build instead of per-field setters
+                            embed = discord.Embed.from_dict({
+                                'title': "🏰 Siege Plan Notifications Sent",
+                                'description': f"Successfully notified participants for siege plan #{plan_id}",
+                                'color': discord.Color.green().value,
+                                'fields': [
+                                    {'name': "📋 Plan ID", 'value': plan_id, 'inline': True},
+                                    {'name': "📡 Response", 'value': text_response[:1000], 'inline': False},
+                                ],
+                                'footer': {'text': f"Parse error: {str(parse_error)}"},
+                            })
                             await interaction.followup.send(embed=embed)
                     else:
                         error_text = await resp.text()
-                        embed = discord.Embed(
-                            title="❌ Notification Failed",
-                            description=f"Failed to notify participants for siege plan #{plan_id}",
-                            color=discord.Color.red()
-                        )
-                        embed.add_field(name="📋 Plan ID", value=plan_id, inline=True)
-                        embed.add_field(name="🚫 Error", value=f"HTTP {resp.status}: {error_text[:500]}", inline=False)
+                        embed = discord.Embed.from_dict({
+                            'title': "❌ Notification Failed",
+                            'description': f"Failed to notify participants for siege plan #{plan_id}",
+                            'color': discord.Color.red().value,
+                            'fields': [
+                                {'name': "📋 Plan ID", 'value': plan_id, 'inline': True},
+                                {'name': "🚫 Error", 'value': f"HTTP {resp.status}: {error_text[:500]}", 'inline': False},
+                            ],
+                        })
                         await interaction.followup.send(embed=embed)
             
             elif action.value == "edit":
                 # Provide edit link
                 edit_url = f"{self.server_url}/siege-plan/{plan_id}/assign/"
                 
-                embed = discord.Embed(
-                    title="✏️ Edit Siege Plan",
-                    description=f"Click the link below to edit siege plan #{plan_id}",
-                    color=discord.Color.blue()
-                )
-                embed.add_field(name="📋 Plan ID", value=plan_id, inline=True)
-                embed.add_field(name="🔗 Edit Link", value=f"[Click Here to Edit]({edit_url})", inline=False)
-                embed.set_footer(text="This link will open in your browser")
-                
+                embed = discord.Embed.from_dict({
+                    'title': "✏️ Edit Siege Plan",
+                    'description': f"Click the link below to edit siege plan #{plan_id}",
+                    'color': discord.Color.blue().value,
+                    'fields': [
+                        {'name': "📋 Plan ID", 'value': plan_id, 'inline': True},
+                        {'name': "🔗 Edit Link", 'value': f"[Click Here to Edit]({edit_url})", 'inline': False},
+                    ],
+                    'footer': {'text': "This link will open in your browser"},
+                })
+
                 await interaction.followup.send(embed=embed)
             
             else:
@@ -699,60 +865,211 @@ class HydraChimeraCommands(commands.Cog):
     
     async def context_hydra(self, interaction: discord.Interaction, message: discord.Message):
         """Context menu: Process message as Hydra clash"""
-        if not self.clan_list:
-            await interaction.response.defer(ephemeral=True, thinking=True)
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        clan_list = await self._get_clans()
+        if not clan_list:
             await interaction.followup.send("❌ Clan list is not loaded. Please try again later.", ephemeral=True)
-            print("[clash_processing] Clan list is empty when context_hydra called!")
+            logger.warning("Clan list is empty when context_hydra called!")
             return
-        await interaction.response.defer(ephemeral=True, thinking=True)
-        view = ClanSelectView(message, "hydra", self, self.clan_list, interaction.user)
+        view = ClanSelectView(message, "hydra", self, clan_list, interaction.user)
         await interaction.followup.send("Select your clan for Hydra clash:", view=view, ephemeral=True)
 
     async def context_chimera(self, interaction: discord.Interaction, message: discord.Message):
         """Context menu: Process message as Chimera clash"""
-        if not self.clan_list:
-            await interaction.response.defer(ephemeral=True, thinking=True)
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        clan_list = await self._get_clans()
+        if not clan_list:
             await interaction.followup.send("❌ Clan list is not loaded. Please try again later.", ephemeral=True)
-            print("[clash_processing] Clan list is empty when context_chimera called!")
+            logger.warning("Clan list is empty when context_chimera called!")
             return
-        await interaction.response.defer(ephemeral=True, thinking=True)
-        view = ClanSelectView(message, "chimera", self, self.clan_list, interaction.user)
+        view = ClanSelectView(message, "chimera", self, clan_list, interaction.user)
         await interaction.followup.send("Select your clan for Chimera clash:", view=view, ephemeral=True)
-    async def _process_clash_message(self, message: discord.Message, clash_type: str, clan_token: str, dry_run: bool = False, date_recorded: Optional[str] = None):
-        """Process a message for clash data"""
-        try:
-            # Extract images from the message
+    @staticmethod
+    def _build_result_embed(result: dict, clash_type: str, clan: Optional[str], message_id: int) -> discord.Embed:
+        """Success/failure embed shared by the modal submit handlers"""
+        if result['success']:
+            preview = result.get('dry_run_payload')
+            fields = [
+                {'name': "🏰 Clan", 'value': clan or "Not specified", 'inline': True},
+                {'name': "📊 Images", 'value': str(result.get('image_count', 0)), 'inline': True},
+                {'name': "🔄 Mode", 'value': "Dry Run" if preview is not None else "Live", 'inline': True},
+            ]
+            if preview is not None:
+                suffix = "\n... (truncated)" if result.get('dry_run_truncated') else ""
+                fields.append({'name': "📋 Preview Payload", 'value': f"```json\n{preview}{suffix}\n```", 'inline': False})
+            if result.get('view_url'):
+                fields.append({'name': "🔗 View Record", 'value': f"[Click Here]({result['view_url']})", 'inline': False})
+            return discord.Embed.from_dict({
+                'title': _SUCCESS_TITLE.get(clash_type, f"✅ {clash_type.title()} Processing Complete"),
+                'color': discord.Color.green().value,
+                'fields': fields,
+                'footer': {'text': f"Processed from message {message_id}"},
+            })
+        return discord.Embed.from_dict({
+            'title': _FAIL_TITLE.get(clash_type, f"❌ {clash_type.title()} Processing Failed"),
+            'description': result.get('error', 'Unknown error occurred'),
+            'color': discord.Color.red().value,
+        })
+
+    async def _extract_with_cache(self, img_data: bytes, filename: str, clash_type: str):
+        """_post_image_extraction behind the content-addressed OCR cache.
+
+        Identical screenshots (retries, a dry run followed by a live run,
+        reprocessing) answer from the LRU instead of repeating the OCR
+        call. Only parsed scores or the error string are stored, never
+        image bytes; failures are served for just the negative TTL window
+        so an unreadable screenshot can be retried.
+        """
+        if len(img_data) > self._OFFLOAD_BYTES:
+            digest = await asyncio.to_thread(hashlib.blake2b, img_data, digest_size=16)
+        else:
+            digest = hashlib.blake2b(img_data, digest_size=16)
+        cache_key = (clash_type, digest.digest())
+        cached = self._ocr_cache.get(cache_key)
+        if cached is not None and cached[0] == 'fail' and time.monotonic() - cached[2] >= self._NEG_TTL:
+            # Negative entries go stale quickly; retry the backend
+            del self._ocr_cache[cache_key]
+            cached = None
+        if cached is not None:
+            self._ocr_cache.move_to_end(cache_key)
+            if cached[0] == 'ok':
+                return {'success': True, 'data': cached[1]}
+            return {'success': False, 'error': cached[1]}
+        extraction_result = await self._post_image_extraction(img_data, filename, f"{clash_type} clash record")
+        if extraction_result['success']:
+            entry = ('ok', extraction_result['data'], time.monotonic())
+        else:
+            entry = ('fail', extraction_result.get('error'), time.monotonic())
+        self._ocr_cache[cache_key] = entry
+        if len(self._ocr_cache) > self._OCR_CACHE_MAX:
+            self._ocr_cache.popitem(last=False)
+        return extraction_result
+
+    def _prefetch_extraction(self, message: discord.Message, clash_type: str):
+        """Start extracting `message`'s first image in the background.
+
+        Called when a selection UI opens, so the slow OCR round-trip runs
+        while the user is still picking a clan or typing a date. Returns a
+        task resolving to (images, extraction_result), or None when the
+        message has no images.
+        """
+        async def _run():
             images = await self._extract_images_from_message(message)
             if not images:
+                return None
+            img_data = await self._materialize(images[0][0])
+            images[0] = (img_data, images[0][1])
+            result = await self._extract_with_cache(img_data, images[0][1], clash_type)
+            return images, result
+
+        return asyncio.create_task(_run())
+
+    async def _process_clash_message(self, message: discord.Message, clash_type: str, clan_token: str, dry_run: bool = False, date_recorded: Optional[str] = None, extraction_task=None):
+        """Process a message for clash data"""
+        try:
+            # Nothing attached or embedded: answer without building the
+            # extraction machinery at all
+            if not message.attachments and not message.embeds:
                 return {'success': False, 'error': 'No images found'}
-            return await self._process_clash_images(images, clash_type, clan_token, dry_run, date_recorded)
-        except Exception as e:
+            # Dry runs have no side effects; serve a recent identical run
+            # from cache instead of repeating the OCR + HTTP round-trips.
+            # Live runs always hit the backend.
+            result_key = None
+            if dry_run:
+                result_key = (message.id, clash_type, clan_token, date_recorded)
+                hit = self._result_cache.get(result_key)
+                if hit is not None:
+                    if time.monotonic() - hit[0] < self._RESULT_TTL:
+                        self._result_cache.move_to_end(result_key)
+                        return hit[1]
+                    del self._result_cache[result_key]
+            # Reuse a prefetched extraction when the UI started one; it has
+            # usually finished by the time the user submits the modal
+            if extraction_task is not None:
+                prefetched = await extraction_task
+                if prefetched is None:
+                    return {'success': False, 'error': 'No images found'}
+                images, extraction_result = prefetched
+                result = await self._process_clash_images(
+                    images, clash_type, clan_token, dry_run, date_recorded,
+                    extraction_result=extraction_result
+                )
+            else:
+                # Extract images from the message
+                images = await self._extract_images_from_message(message)
+                if not images:
+                    return {'success': False, 'error': 'No images found'}
+                result = await self._process_clash_images(images, clash_type, clan_token, dry_run, date_recorded)
+            # Only successful dry runs are cached; failures should retry
+            if result_key is not None and result.get('success'):
+                self._result_cache[result_key] = (time.monotonic(), result)
+                if len(self._result_cache) > self._RESULT_CACHE_MAX:
+                    self._result_cache.popitem(last=False)
+            return result
+        except (aiohttp.ClientError, asyncio.TimeoutError, discord.DiscordException) as e:
+            # Expected I/O failures become user-facing errors; programmer
+            # errors propagate to the caller / task exception handler
             return {'success': False, 'error': str(e)}
 
-    async def _process_clash_images(self, images: list, clash_type: str, clan_token: Optional[str], dry_run: bool = False, date_recorded: Optional[str] = None):
+    async def _process_clash_images(self, images: list, clash_type: str, clan_token: Optional[str], dry_run: bool = False, date_recorded: Optional[str] = None, extraction_result=None):
         """Process images for clash data"""
         try:
             if not images:
                 return {'success': False, 'error': 'No images provided'}
             # Process first image (assuming one score image per request)
             img_data, filename = images[0]
-            # Extract data from image
-            extraction_result = await self._post_image_extraction(img_data, filename, f"{clash_type} clash record")
+            # Extract data from image. Identical screenshots (retries, a
+            # dry run followed by a live run, reprocessing) hit the
+            # content-addressed cache via _extract_with_cache; prefetched
+            # results arrive already cached by the same helper. Streamed
+            # images skip the cache — hashing them would mean buffering the
+            # bytes we just avoided buffering.
+            if extraction_result is None:
+                if isinstance(img_data, bytes):
+                    extraction_result = await self._extract_with_cache(img_data, filename, clash_type)
+                else:
+                    extraction_result = await self._post_image_extraction(img_data, filename, f"{clash_type} clash record")
             if not extraction_result['success']:
                 return {'success': False, 'error': f"Image extraction failed: {extraction_result.get('error')}"}
+            # Extract any further images concurrently and merge their scores
+            # into the same payload instead of silently dropping them
+            scores = extraction_result['data']
+            if len(images) > 1:
+                # Leaf helpers bound themselves on the shared request semaphore
+                extra_results = await asyncio.gather(
+                    *[
+                        self._post_image_extraction(extra_data, extra_name, f"{clash_type} clash record")
+                        for extra_data, extra_name in images[1:]
+                    ],
+                    return_exceptions=True
+                )
+                merged = list(scores) if isinstance(scores, list) else [scores]
+                for extra in extra_results:
+                    if isinstance(extra, BaseException):
+                        logger.warning("Extra image extraction failed: %s", extra)
+                    elif extra.get('success'):
+                        data = extra['data']
+                        merged.extend(data if isinstance(data, list) else [data])
+                    else:
+                        logger.warning("Extra image extraction failed: %s", extra.get('error'))
+                scores = merged
             # Prepare payload for injection or return extraction-only when clash_type is falsy
             payload = {
-                "opponent_scores": extraction_result['data'],
-                "date_recorded": discord.utils.utcnow().isoformat().replace("+00:00", "Z") if not date_recorded else date_recorded
+                "opponent_scores": scores,
+                "date_recorded": date_recorded if date_recorded else _iso_z(utcnow())
             }
             # Only add clan if provided
             if clan_token:
                 payload["clan"] = clan_token
             if dry_run:
+                # Serialize and truncate the preview once here; display sites
+                # just embed the string and check the flag
+                rendered = orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode('utf-8')
                 return {
                     'success': True,
                     'image_count': len(images),
-                    'dry_run_payload': json.dumps(payload, indent=2),
+                    'dry_run_payload': rendered[:500],
+                    'dry_run_truncated': len(rendered) > 500,
                     'message': 'DRY RUN - Would send this payload'
                 }
             # If clash_type is falsy, don't call the injection endpoint — return
@@ -762,7 +1079,7 @@ class HydraChimeraCommands(commands.Cog):
                 return {
                     'success': True,
                     'image_count': len(images),
-                    'extraction': extraction_result['data'],
+                    'extraction': scores,
                     'message': 'Extraction-only result'
                 }
 
@@ -783,40 +1100,66 @@ class HydraChimeraCommands(commands.Cog):
                 }
             else:
                 return {'success': False, 'error': f"Injection failed: {inject_result.get('error')}"}
-        except Exception as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError, KeyError) as e:
+            # Expected I/O and payload-shape failures become user-facing
+            # errors; programmer errors propagate instead of being swallowed
             return {'success': False, 'error': str(e)}
 
 # --- ClanSelectView for dropdown-based clan selection ---
 class ClanSelectView(discord.ui.View):
+    # Slot descriptors give C-level attribute access on the per-click hot
+    # path (the base View still carries a __dict__ for its own state)
+    __slots__ = ('message', 'clash_type', 'cog', 'user', '_user_id', '_extraction_task')
+
     def __init__(self, message: discord.Message, clash_type: str, cog: HydraChimeraCommands, clan_list: list, user: discord.User):
         super().__init__(timeout=60)
         self.message = message
         self.clash_type = clash_type
         self.cog = cog
         self.user = user
+        # interaction_check fires on every component interaction; compare
+        # against a plain int instead of re-reading user.id each time
+        self._user_id = user.id
+        # Overlap the OCR round-trip with the user's dropdown/modal time
+        self._extraction_task = cog._prefetch_extraction(message, clash_type)
         self.add_item(ClanSelectDropdown(clan_list, self))
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         # Only allow the user who invoked the context action to interact
-        if interaction.user.id != self.user.id:
+        if interaction.user.id != self._user_id:
             await interaction.response.send_message("You cannot interact with this menu.", ephemeral=True)
             return False
         return True
 
+    async def on_timeout(self):
+        # Abandoned menu: stop the speculative extraction and drop the
+        # references keeping the message/cog alive so memory stays flat
+        # under many walked-away-from menus
+        if self._extraction_task is not None:
+            self._extraction_task.cancel()
+            self._extraction_task = None
+        self.message = None
+        self.user = None
+        self.stop()
+
 
 class ClanTokenModal(discord.ui.Modal, title='Clan Information'):
     """Modal dialog to collect clan token for processing"""
-    
+
+    __slots__ = ('message', 'clash_type', 'cog', 'clan_list', '_extraction_task', 'clan_token')
+
     def __init__(self, message: discord.Message, clash_type: str, cog: HydraChimeraCommands, clan_list: list):
         super().__init__()
         self.message = message
         self.clash_type = clash_type
         self.cog = cog
         self.clan_list = clan_list
+        # Overlap the OCR round-trip with the user's time in the modal
+        self._extraction_task = cog._prefetch_extraction(message, clash_type)
         # Use a String Select for clan selection (discord.py handles Action Row)
         self.clan_token = discord.ui.Select(
             placeholder='Select your clan',
-            options=[discord.SelectOption(label=clan, value=clan) for clan in clan_list[:25]],
+            options=cog._clan_options_for(clan_list),
             min_values=0 if clash_type == 'hydra' else 1,
             max_values=1
         )
@@ -838,46 +1181,32 @@ class ClanTokenModal(discord.ui.Modal, title='Clan Information'):
             if self.clash_type == 'chimera' and not clan_token_value:
                 await interaction.followup.send("❌ Clan name is required for Chimera processing.")
                 return
+            # Allocation-free check of the 1-char field: no .lower() copy
+            v = self.dry_run.value
+            is_dry_run = bool(v) and v[0] in ('y', 'Y')
             # Process the message
             result = await self.cog._process_clash_message(
-                self.message, 
-                self.clash_type, 
+                self.message,
+                self.clash_type,
                 clan_token_value,
-                dry_run=False
+                dry_run=is_dry_run,
+                extraction_task=self._extraction_task
             )
-            if result['success']:
-                embed = discord.Embed(
-                    title=f"✅ {self.clash_type.title()} Processing Complete",
-                    color=discord.Color.green()
-                )
-                embed.add_field(name="🏰 Clan", value=clan_token_value or "Not specified", inline=True)
-                embed.add_field(name="📊 Images", value=str(result.get('image_count', 0)), inline=True)
-                embed.add_field(name="🔄 Mode", value="Live", inline=True)
-                if result.get('view_url'):
-                    embed.add_field(name="🔗 View Record", value=f"[Click Here]({result['view_url']})", inline=False)
-                if result.get('dry_run_payload'):
-                    preview = result['dry_run_payload'][:1000]
-                    if len(result['dry_run_payload']) > 1000:
-                        preview += "\n... (truncated)"
-                    embed.add_field(name="📋 Preview Payload", value=f"```json\n{preview}\n```", inline=False)
-                embed.set_footer(text=f"Processed from message {self.message.id}")
-                await interaction.followup.send(embed=embed)
-            else:
-                embed = discord.Embed(
-                    title=f"❌ {self.clash_type.title()} Processing Failed",
-                    description=result.get('error', 'Unknown error occurred'),
-                    color=discord.Color.red()
-                )
-                await interaction.followup.send(embed=embed)
+            embed = self.cog._build_result_embed(result, self.clash_type, clan_token_value, self.message.id)
+            await interaction.followup.send(embed=embed)
         except Exception as e:
             await interaction.followup.send(f"❌ Error processing {self.clash_type}: {e}")
     
     async def on_error(self, interaction: discord.Interaction, error: Exception) -> None:
-        logging.exception("Error in ClanTokenModal")
+        logger.exception("Error in ClanTokenModal")
+        msg = f"❌ An error occurred: {error}"
         try:
-            await interaction.response.send_message(f"❌ An error occurred: {error}", ephemeral=True)
-        except:
-            await interaction.followup.send(f"❌ An error occurred: {error}")
+            await interaction.response.send_message(msg, ephemeral=True)
+        except discord.InteractionResponded:
+            # Already acknowledged (e.g. the defer in on_submit went through
+            # before the failure) — fall back to a followup. Anything else
+            # bubbles to discord.py's task exception handler.
+            await interaction.followup.send(msg)
 
 
 async def setup(bot):
@@ -886,75 +1215,67 @@ async def setup(bot):
 
 
 class ClanSelectDropdown(discord.ui.Select):
+    __slots__ = ('parent_view',)
+
     def __init__(self, clan_list: list, parent_view: ClanSelectView):
-        options = [discord.SelectOption(label=clan, value=clan) for clan in clan_list[:25]]
+        options = parent_view.cog._clan_options_for(clan_list)
         super().__init__(placeholder="Select your clan", min_values=1, max_values=1, options=options)
         self.parent_view = parent_view
 
     async def callback(self, interaction: discord.Interaction):
-        clan_token_value = self.values[0]
         # Show modal for date input after clan selection
-        parent_view = self.parent_view
-        class DateInputModal(discord.ui.Modal, title="Date Recorded"):
-            def __init__(self, parent_view):
-                super().__init__()
-                self.parent_view = parent_view
-                self.date_recorded = discord.ui.TextInput(
-                    label="Date Recorded (YYYY-MM-DD)",
-                    placeholder="e.g. 2025-10-15 (leave blank for today)",
-                    required=False,
-                    max_length=10
-                )
-                self.add_item(self.date_recorded)
+        await interaction.response.send_modal(DateInputModal(self.parent_view, self.values[0]))
 
-            async def on_submit(self, modal_interaction: discord.Interaction):
-                import datetime
-                from discord.utils import utcnow
-                date_str = self.date_recorded.value.strip()
-                if date_str:
-                    try:
-                        # Use noon to avoid timezone issues, then format as UTC Z
-                        date_obj = datetime.datetime.strptime(date_str, "%Y-%m-%d")
-                        date_obj = date_obj.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=datetime.timezone.utc)
-                        date_iso = date_obj.isoformat().replace("+00:00", "Z")
-                    except Exception:
-                        await modal_interaction.response.send_message("❌ Invalid date format. Use YYYY-MM-DD.", ephemeral=True)
-                        return
-                else:
-                    date_iso = utcnow().isoformat().replace("+00:00", "Z")
-                await modal_interaction.response.defer(thinking=True)
-                result = await self.parent_view.cog._process_clash_message(
-                    self.parent_view.message,
-                    self.parent_view.clash_type,
-                    clan_token_value,
-                    dry_run=False,
-                    date_recorded=date_iso
-                )
-                if result['success']:
-                    embed = discord.Embed(
-                        title=f"✅ {self.parent_view.clash_type.title()} Processing Complete",
-                        color=discord.Color.green()
-                    )
-                    embed.add_field(name="🏰 Clan", value=clan_token_value or "Not specified", inline=True)
-                    embed.add_field(name="📊 Images", value=str(result.get('image_count', 0)), inline=True)
-                    embed.add_field(name="🔄 Mode", value="Live", inline=True)
-                    if result.get('view_url'):
-                        embed.add_field(name="🔗 View Record", value=f"[Click Here]({result['view_url']})", inline=False)
-                    if result.get('dry_run_payload'):
-                        preview = result['dry_run_payload'][:1000]
-                        if len(result['dry_run_payload']) > 1000:
-                            preview += "\n... (truncated)"
-                        embed.add_field(name="📋 Preview Payload", value=f"```json\n{preview}\n```", inline=False)
-                    embed.set_footer(text=f"Processed from message {self.parent_view.message.id}")
-                    await modal_interaction.followup.send(embed=embed, ephemeral=True)
-                else:
-                    embed = discord.Embed(
-                        title=f"❌ {self.parent_view.clash_type.title()} Processing Failed",
-                        description=result.get('error', 'Unknown error occurred'),
-                        color=discord.Color.red()
-                    )
-                    await modal_interaction.followup.send(embed=embed, ephemeral=True)
-        await interaction.response.send_modal(DateInputModal(parent_view))
-    
-    
-    
\ No newline at end of file
+
+class DateInputModal(discord.ui.Modal, title="Date Recorded"):
+    """Date prompt shown after clan selection; submits the processing run"""
+
+    __slots__ = ('message', 'clash_type', 'cog', 'clan_token_value', '_extraction_task', 'date_recorded')
+
+    def __init__(self, parent_view: ClanSelectView, clan_token_value: str):
+        super().__init__()
+        # Capture everything on_submit needs up front: the parent view's
+        # 60s timer keeps counting while this modal is open, and its
+        # on_timeout clears the view's references. Taking the extraction
+        # task over (and detaching it from the view) also stops the timeout
+        # from cancelling it under a slow-typing user.
+        self.message = parent_view.message
+        self.clash_type = parent_view.clash_type
+        self.cog = parent_view.cog
+        self.clan_token_value = clan_token_value
+        self._extraction_task = parent_view._extraction_task
+        parent_view._extraction_task = None
+        self.date_recorded = discord.ui.TextInput(
+            label="Date Recorded (YYYY-MM-DD)",
+            placeholder="e.g. 2025-10-15 (leave blank for today)",
+            required=False,
+            max_length=10
+        )
+        self.add_item(self.date_recorded)
+
+    async def on_submit(self, modal_interaction: discord.Interaction):
+        date_str = self.date_recorded.value.strip()
+        if date_str:
+            try:
+                # strptime already zeroes the time components; just
+                # pin the timezone and format as UTC Z
+                date_obj = datetime.datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=datetime.timezone.utc)
+                date_iso = _iso_z(date_obj)
+            except Exception:
+                await modal_interaction.response.send_message("❌ Invalid date format. Use YYYY-MM-DD.", ephemeral=True)
+                return
+        else:
+            date_iso = _iso_z(utcnow())
+        await modal_interaction.response.defer(thinking=True)
+        result = await self.cog._process_clash_message(
+            self.message,
+            self.clash_type,
+            self.clan_token_value,
+            dry_run=False,
+            date_recorded=date_iso,
+            extraction_task=self._extraction_task
+        )
+        embed = self.cog._build_result_embed(
+            result, self.clash_type, self.clan_token_value, self.message.id
+        )
+        await modal_interaction.followup.send(embed=embed, ephemeral=True)
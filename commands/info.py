@@ -0,0 +1,102 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+
+
+class InfoCommands(commands.Cog):
+    """General bot information commands (/help, /info, /ping)"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        # /help reflects the registered command set, which only changes on
+        # cog load/unload or a sync — build the embed once and reuse it
+        # (embeds are reusable across sends), invalidating on those events
+        self._help_embed = None
+        # len(bot.users) walks the whole user cache; keep a counter updated
+        # from member events instead and only do the full count on_ready
+        self._user_count = 0
+        # Static /info scaffolding built once; per call only the three
+        # dynamic field values (servers/users/latency) are filled in
+        self._info_embed_dict = {
+            "title": "ℹ️ RaidEye Bot",
+            "description": "Raid processing and clan statistics for Raid: Shadow Legends",
+            "color": discord.Color.blue().value,
+            "footer": {"text": "Use /help for the command list"},
+            "fields": [
+                {"name": "Servers", "value": "", "inline": True},
+                {"name": "Cached Users", "value": "", "inline": True},
+                {"name": "Latency", "value": "", "inline": True},
+                {"name": "Library", "value": f"discord.py {discord.__version__}", "inline": True},
+            ],
+        }
+        # /ping gets spammed; keep one prebuilt embed per color and only
+        # swap the description in per call
+        self._ping_embed_green = discord.Embed(title="🏓 Pong!", color=discord.Color.green())
+        self._ping_embed_orange = discord.Embed(title="🏓 Pong!", color=discord.Color.orange())
+
+    async def cog_load(self):
+        self._help_embed = None
+
+    async def cog_unload(self):
+        self._help_embed = None
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # The tree may have been synced while connecting; drop the cache so
+        # the next /help rebuilds against the current command set
+        self._help_embed = None
+        # Resync the counter with the now-populated cache; after this only
+        # the join/remove listeners touch it
+        self._user_count = len(self.bot.users)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        self._user_count += 1
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        self._user_count -= 1
+
+    def _build_help_embed(self):
+        """Build the /help embed from the current command tree"""
+        lines = [
+            f"• **/{cmd.name}** — {cmd.description or 'No description'}"
+            for cmd in self.bot.tree.get_commands()
+            if isinstance(cmd, app_commands.Command)
+        ]
+        return discord.Embed.from_dict({
+            "title": "📖 RaidEye Bot Commands",
+            "description": "\n".join(lines) or "No commands registered",
+            "color": discord.Color.blue().value,
+            "footer": {"text": "Right-click a message → Apps for context menu actions"},
+        })
+
+    @app_commands.command(name="help", description="List the bot's commands")
+    async def help(self, interaction: discord.Interaction):
+        """Show the cached command listing, rebuilding it only when stale"""
+        if self._help_embed is None:
+            self._help_embed = self._build_help_embed()
+        await interaction.response.send_message(embed=self._help_embed)
+
+    @app_commands.command(name="info", description="Show bot information")
+    async def info(self, interaction: discord.Interaction):
+        """Show general information about the bot"""
+        embed = discord.Embed.from_dict(self._info_embed_dict)
+        embed.set_field_at(0, name="Servers", value=str(len(self.bot.guilds)), inline=True)
+        embed.set_field_at(1, name="Cached Users", value=str(self._user_count), inline=True)
+        embed.set_field_at(2, name="Latency", value=f"{round(self.bot.latency * 1000)}ms", inline=True)
+        embed.timestamp = discord.utils.utcnow()
+        await interaction.response.send_message(embed=embed)
+
+    @app_commands.command(name="ping", description="Check the bot's latency")
+    async def ping(self, interaction: discord.Interaction):
+        """Report the gateway latency"""
+        latency = int(self.bot.latency * 1000)
+        embed = self._ping_embed_green if latency < 100 else self._ping_embed_orange
+        embed.description = f"Gateway latency: **{latency}ms**"
+        await interaction.response.send_message(embed=embed)
+
+
+async def setup(bot):
+    """Setup function called by discord.py when loading this cog"""
+    await bot.add_cog(InfoCommands(bot))
@@ -2,26 +2,68 @@
 Bot configuration settings
 """
 
+import logging
 import os
+from dataclasses import dataclass
+
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Discord Configuration
-DISCORD_BOT_TOKEN = os.getenv('DISCORD_BOT_TOKEN')
-BOT_PREFIX = os.environ.get("BOT_PREFIX", "!")
-DEBUG_MODE = os.getenv('DEBUG_MODE', 'False').lower() == 'true'
+log = logging.getLogger(__name__)
+
+
+def _env_int(name, default):
+    """Read an int env var, logging and falling back instead of crashing import"""
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        log.warning("Invalid integer for %s: %r — using default %s", name, raw, default)
+        return default
+
+
+@dataclass(frozen=True, slots=True)
+class BotConfig:
+    """Immutable snapshot of the bot's settings, built once at import.
+
+    frozen + slots makes attribute access a C-level descriptor lookup and
+    stops accidental mutation of shared config at runtime.
+    """
+    discord_bot_token: str
+    bot_prefix: str
+    debug_mode: bool
+    guild_id: int
+    main_channel_id: int
+    raideye_server: str
+    bot_name: str = "RaidEye Bot"
+    bot_version: str = "1.0.0"
+    bot_description: str = "A Discord bot focused on raid management and clan activities"
+
 
-# Server and Channel Configuration
-GUILD_ID = int(os.getenv('GUILD_ID', 710875600637788170))  # Your Discord server ID
-MAIN_CHANNEL_ID = int(os.environ.get("MAIN_CHANNEL_ID", 0))
-RAIDEYE_SERVER = os.environ.get("RAIDEYE_SERVER", "http://127.0.0.1:8000")
+CONFIG = BotConfig(
+    discord_bot_token=os.getenv('DISCORD_BOT_TOKEN'),
+    bot_prefix=os.environ.get("BOT_PREFIX", "!"),
+    debug_mode=os.getenv('DEBUG_MODE', 'False').lower() == 'true',
+    guild_id=_env_int('GUILD_ID', 710875600637788170),  # Your Discord server ID
+    main_channel_id=_env_int('MAIN_CHANNEL_ID', 0),
+    raideye_server=os.environ.get("RAIDEYE_SERVER", "http://127.0.0.1:8000"),
+)
 
-# Additional configuration options
-BOT_NAME = "RaidEye Bot"
-BOT_VERSION = "1.0.0"
-BOT_DESCRIPTION = "A Discord bot focused on raid management and clan activities"
+# Legacy module-level names — everything below reads from CONFIG so existing
+# `from config import GUILD_ID` imports keep working
+DISCORD_BOT_TOKEN = CONFIG.discord_bot_token
+BOT_PREFIX = CONFIG.bot_prefix
+DEBUG_MODE = CONFIG.debug_mode
+GUILD_ID = CONFIG.guild_id
+MAIN_CHANNEL_ID = CONFIG.main_channel_id
+RAIDEYE_SERVER = CONFIG.raideye_server
+BOT_NAME = CONFIG.bot_name
+BOT_VERSION = CONFIG.bot_version
+BOT_DESCRIPTION = CONFIG.bot_description
 
 # You can add more channel IDs as needed
 CHANNELS = {
@@ -38,4 +80,4 @@ REQUIRED_PERMISSIONS = [
     'embed_links',
     'read_message_history',
     'add_reactions'
-]
\ No newline at end of file
+]